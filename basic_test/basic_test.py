@@ -1,31 +1,40 @@
-"""ESolar Cloud Platform Basic Test"""
-import requests
-import json
-import sys
-from esolar import get_esolar_data
-
-USER = "NAME"
-PASSWORD = "PASSWORD"
-REGION="in"
-OUTPUT_FILE = "output.txt"
-
-f=open(OUTPUT_FILE, "w")
-try:
-    print("Obtaining plant information")
-    plant_info = get_esolar_data(REGION, USER, PASSWORD)
-    
-    print(f"\nProducing the output into {OUTPUT_FILE}")
-    f.write(json.dumps(plant_info))
-
-    f.close()
-    
-except requests.exceptions.HTTPError as errh:
-    sys.exit(errh)
-except requests.exceptions.ConnectionError as errc:
-    sys.exit(errc)
-except requests.exceptions.Timeout as errt:
-    sys.exit(errt)
-except requests.exceptions.RequestException as errr:
-    sys.exit(errr)
-except ValueError as errv:
-    sys.exit(errv)
+"""ESolar Cloud Platform Basic Test"""
+import aiohttp
+import asyncio
+import json
+import sys
+from esolar import ESolarSession, get_esolar_data
+
+USER = "NAME"
+PASSWORD = "PASSWORD"
+REGION="in"
+OUTPUT_FILE = "output.txt"
+
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        return await get_esolar_data(
+            REGION, ESolarSession(session, REGION, USER, PASSWORD)
+        )
+
+
+f=open(OUTPUT_FILE, "w")
+try:
+    print("Obtaining plant information")
+    plant_info = asyncio.run(main())
+
+    print(f"\nProducing the output into {OUTPUT_FILE}")
+    f.write(json.dumps(plant_info))
+
+    f.close()
+
+except aiohttp.ClientResponseError as errh:
+    sys.exit(errh)
+except aiohttp.ClientConnectionError as errc:
+    sys.exit(errc)
+except asyncio.TimeoutError as errt:
+    sys.exit(errt)
+except aiohttp.ClientError as errr:
+    sys.exit(errr)
+except ValueError as errv:
+    sys.exit(errv)
@@ -1,400 +1,230 @@
 """The eSolar integration."""
 from __future__ import annotations
 
-from collections.abc import Mapping
-from datetime import timedelta
+from collections import deque
+from collections.abc import Awaitable, Mapping
+from datetime import datetime, timedelta
 import logging
 from typing import Any, TypedDict, cast
 
-import requests
+import aiohttp
+from astral import LocationInfo
+from astral.location import Location
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_REGION, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.sun import (
+    get_astral_location,
+    get_location_astral_event_next,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import CONF_MONITORED_SITES, CONF_PV_GRID_DATA, CONF_UPDATE_INTERVAL, DOMAIN
-from .esolar import get_esolar_data
+from homeassistant.util import dt as dt_util, ssl as ssl_util
+
+from .const import (
+    CONF_ACCOUNT_DEVICE_LIST,
+    CONF_DEADBAND,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_INVERTER_SENSORS,
+    CONF_LIVE_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_ENDPOINT_INTERVAL,
+    CONF_METADATA_INTERVAL,
+    CONF_MONITORED_SITES,
+    CONF_NIGHT_INTERVAL,
+    CONF_PLANT_LIST_ONLY,
+    CONF_PV_GRID_DATA,
+    DATA_RATE_LIMITERS,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
+    DEFAULT_MAX_ENDPOINT_INTERVAL,
+    DEFAULT_METADATA_INTERVAL,
+    DEFAULT_NIGHT_INTERVAL,
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY_SESSION,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
+)
+from .esolar import (
+    DEFAULT_MAX_CONCURRENCY,
+    PRIORITY_METADATA,
+    REQUEST_PRIORITY,
+    ESolarSession,
+    RateLimiter,
+    get_esolar_live_data,
+    get_esolar_metadata,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# Options that decide which entities exist, a snapshot is only valid for these
+SNAPSHOT_OPTIONS = (
+    CONF_MONITORED_SITES,
+    CONF_INVERTER_SENSORS,
+    CONF_PV_GRID_DATA,
+    CONF_PLANT_LIST_ONLY,
+)
+# Plant lists that the device index and the plant aggregates cover
+PLANT_LISTS = ("kitList", "beanList", "peakList")
+# Bumped when the decoded records change shape, older snapshots are ignored
+SNAPSHOT_FORMAT = 3
+# Time after an expected upload at which its data is polled
+UPLOAD_DELAY = timedelta(seconds=30)
+# Differences between upload times that can be an upload cadence
+MIN_UPLOAD_CADENCE = timedelta(minutes=1)
+MAX_UPLOAD_CADENCE = timedelta(minutes=60)
+# Number of recent differences the upload cadence is the shortest of
+UPLOAD_CADENCE_SAMPLES = 5
+
 
 class ESolarStoreFindRawdataPageList(TypedDict):
-    """API response for findRawdataPageList."""
+    """Decoded findRawdataPageList row."""
 
-    nowPrower: float
-    rOutPowerWattStr: str
-    batPower: float
-    rBackupPowerWatt: float
-    pV3StrCurr1Str: str
     timeStart: str
-    pV4Curr: float
-    currSelfConsumePowerStr: str
-    rOutVolt: float
-    totalPVEnergy: float
-    tOutVolt: float
-    createTimeStr: str
     deviceType: int
-    pV4StrCurr2Str: str
-    pv3SeriesCurrent: str
-    rGridFreqStr: str
-    totalBatDisEnergy: float
-    tOutFreqStr: str
-    sGridPowerWattStr: str
-    totalBatChgEnergy: float
-    isAdmin: str
-    pV1StrCurr4: float
-    pV1StrCurr3: float
-    pV1StrCurr2: float
-    pV1StrCurr1: float
-    pv2SeriesCurrent: str
-    POP: float
-    RST: int
-    pvInputMode: str
-    rGridFreq: float
-    sGridFreqStr: str
-    sGridVoltStr: str
-    tOutPowerVAStr: str
-    pV4VoltStr: str
-    batEnergyPercent: float
-    backupTotalLoadPowerWatt: float
-    tableStoreTimeEnd: str
-    tOutVoltStr: str
-    rGridVoltStr: str
-    batVoltStr: str
-    tGridCurrStr: str
+    pV1Volt: float
+    pV1Curr: float
+    pV2Volt: float
+    pV2Curr: float
+    pV3Volt: float
+    pV3Curr: float
+    rGridVolt: float
     rGridCurr: float
-    rOutFreqStr: str
-    userId: str
-    partitionName: str
-    sGridVolt: float
-    pV3PowerStr: str
-    tOnGridOutVolt: float
-    tGridPowerWattStr: str
-    pV2StrCurr4Str: str
-    ctPVPowerWattStr: str
-    pV4StrCurr3Str: str
-    tOutPowerWatt: float
-    pV3Power: float
-    pV1CurrStr: str
-    pV2CurrStr: str
-    pV4CurrStr: str
-    onLineStr: str
-    pV2Power: float
-    todayBatDisEnergy: float
-    pac: float
-    officeId: str
-    rOutPowerWatt: float
-    pacStr: str
-    powernow: float
-    ctPvCurr: float
-    tGridVoltStr: str
-    powerNower: str
-    pvChannelList: list[Any]
-    pv1SeriesCurrent: str
-    pV1Power: float
-    pV4Volt: float
-    pV3StrCurr2Str: str
-    deviceTempStr: str
+    rGridFreq: float
+    rGridPowerWatt: float
+    rGridPowerVA: float
+    rOutVolt: float
     rOutCurr: float
-    tOutCurr: float
-    todayFeedInEnergyStr: str
-    totalPVEnergyStr: str
-    pV3Curr: float
-    sOnGridOutPowerWatt: float
-    tGridFreqStr: str
-    todayBatChgEnergy: float
-    pV1StrCurr1Str: str
-    tGridFreq: float
-    totalFeedInEnergy: float
-    sOutPowerVAStr: str
-    gridDirection: int
-    batCurrStr: str
-    powerNow: float
+    rOutPowerWatt: float
     rOutPowerVA: float
-    kitType: str
-    pV1VoltStr: str
-    todayLoadEnergy: float
-    sOutPowerWattStr: str
-    pV4StrCurr1: float
-    sGridPowerVA: float
-    pV4StrCurr2: float
-    pV4StrCurr3: float
-    pV4StrCurr4: float
-    sOutPowerVA: float
-    batType: str
-    pV3Volt: float
-    rGridPowerVAStr: str
-    tGridPowerVAStr: str
-    tGridCurr: float
-    rOnGridOutFreq: float
-    pV4StrCurr4Str: str
-    tOutFreq: float
-    todayPVEnergy: float
-    tGridPowerWatt: float
-    sGridPowerVAStr: str
-    tOutCurrStr: str
-    ctPvCurrStr: str
-    pV2Curr: float
-    totalLoadEnergy: float
-    pV2PowerStr: str
-    datetimeStr: str
-    powernower: str
-    PVP: float
-    rGridCurrStr: str
-    totalLoadPowerWattStr: str
-    pV1StrCurr2Str: str
-    nowProwerStr: str
-    totalLoadEnergyStr: str
-    sOutVolt: float
-    ctGridPowerWattStr: str
-    rGridPowerVA: float
-    index: int
-    tGridVolt: float
-    todayFeedInEnergy: float
-    totalBatChgEnergyStr: str
-    tOnGridOutPowerWatt: float
-    pV3VoltStr: str
-    batPowerStr: str
-    pV2Volt: float
-    deviceSn: str
-    todayPVEnergyStr: str
-    pV3StrCurr3Str: str
-    rGridPowerWattStr: str
-    batCapicity: str
-    sGridCurrStr: str
-    sOutCurrStr: str
-    pV2StrCurr2: float
-    timeEnd: str
-    pV2StrCurr1: float
-    pV2StrCurr3Str: str
-    tOutPowerWattStr: str
-    tOutPowerVA: float
-    pV2StrCurr4: float
-    pV2StrCurr3: float
     rOutFreq: float
-    plantuid: str
-    endUser: str
-    totalSellEnergy: float
-    sGridPowerWatt: float
-    pV1StrCurr3Str: str
     rOnGridOutVolt: float
-    totalSellEnergyStr: str
-    deviceModel: str
-    batVolt: float
-    todaySellEnergy: float
-    totalFeedInEnergyStr: str
-    sOutVoltStr: str
-    timeStr: str
-    pV3CurrStr: str
-    pV1Curr: float
-    sOutPowerWatt: float
-    pV3StrCurr1: float
-    pV3StrCurr2: float
     rOnGridOutPowerWatt: float
-    pV3StrCurr3: float
-    pV3StrCurr4: float
-    pv4SeriesCurrent: str
-    kitSN: str
-    pV2StrCurr1Str: str
-    pV4Power: float
-    todaySellEnergyStr: str
-    sOutFreq: float
+    sGridVolt: float
     sGridCurr: float
-    typeStr: str
-    rGridVolt: float
-    rOutPowerVAStr: str
-    rOutCurrStr: str
-    pV4PowerStr: str
-    userUid: str
-    pV2StrCurr2Str: str
-    pV4StrCurr1Str: str
-    ctGridPowerWatt: float
-    deviceTemp: float
-    pV2VoltStr: str
-    sOutFreqStr: str
-    batCurr: float
-    totalBatDisEnergyStr: str
-    pV1PowerStr: str
-    batEnergyPercentStr: str
-    pV1StrCurr4Str: str
-    ctPVPowerWatt: float
-    totalLoadPowerWatt: float
-    todaySelfConsumpEnergy: float
-    rOutVoltStr: str
-    todayLoadEnergyStr: str
-    rGridPowerWatt: float
-    sOutCurr: float
-    pV3StrCurr4Str: str
     sGridFreq: float
-    tGridPowerVA: float
-    meterAStatus: int
-    pV1Volt: float
+    sGridPowerWatt: float
+    sGridPowerVA: float
+    sOutVolt: float
+    sOutCurr: float
+    sOutPowerWatt: float
+    sOutPowerVA: float
+    sOutFreq: float
     sOnGridOutVolt: float
-    todaySelfConsumpEnergyStr: str
-    plantName: str
+    sOnGridOutPowerWatt: float
+    tGridVolt: float
+    tGridCurr: float
+    tGridFreq: float
+    tGridPowerWatt: float
+    tGridPowerVA: float
+    tOutVolt: float
+    tOutCurr: float
+    tOutPowerWatt: float
+    tOutPowerVA: float
+    tOutFreq: float
+    tOnGridOutVolt: float
+    tOnGridOutPowerWatt: float
+    rOnGridOutFreq: float
+    rBackupPowerWatt: float
 
 
 class ESolarStoreDevicePower(TypedDict):
-    """API response for storeDevicePower."""
+    """Decoded storeDevicePower."""
 
-    pvPower: float
+    batCapcity: None | float
+    batCapcityStr: str
+    batEnergyPercent: None | float
+    batCurr: float
+    batteryPower: float
+    batteryDirection: int
     gridPower: float
+    gridDirection: int
     inputOutputPower: float
-    batteryPower: float
+    outPutDirection: int
+    pvPower: float
+    pvDirection: int
     totalLoadPower: float
     homeLoadPower: float
     backupLoadPower: float
     solarPower: float
-    batCurr: float
-    batEnergyPercent: float
-    runningState: int
-    isOnline: int
-    isAlarm: int
-    mark: int
-    batCapcity: float
-    batCapcityStr: str
-    hasMeter: bool
-    hasBattery: bool
-    pvDirection: int
-    gridDirection: int
-    batteryDirection: int
-    outPutDirection: int
     dataTime: int
-    updateDate: int
 
 
 class ESolarKitList(TypedDict):
-    """API response for kitList."""
+    """Decoded kitList entry."""
 
-    invType: str
-    kitType: str
-    monthSellEnergyStr: str
-    todaySellEnergy: float
-    kitSn: str
-    updateDateStr: str
-    ifShowAFCI: int
-    powernower: str
-    mastermcufw: str
+    devicesn: str
     type: int
     devicetype: str
-    onLineStr: str
-    displayfw: str
     devicepc: str
-    powernow: float
-    isShowBattery: int
-    owner: str
-    todaySellEnergyStr: str
-    index: int
-    monthSellEnergy: float
-    devicesn: str
-    userId: str
-    onLine: int
-    slavemcufw: str
-    isModuleExpire: int
-    totalSellEnergy: float
-    totalSellEnergyStr: str
-    isShowHighVoltBat: int
-    isHistory: int
-    mark: int
-    plantName: str
-    dataTimeStr: str
-    findRawdataPageList: ESolarStoreFindRawdataPageList
+    displayfw: str
+    mastermcufw: str
+    kitSn: str
+    onLineStr: str
+    powernow: None | float
+    todaySellEnergy: None | float
+    monthSellEnergy: None | float
+    totalSellEnergy: None | float
+    findRawdataPageList: None | ESolarStoreFindRawdataPageList
     storeDevicePower: ESolarStoreDevicePower
-    status: str
 
 
 class ESolarBeanList(TypedDict):
-    """API response for beanList."""
+    """Decoded beanList entry."""
 
+    devicesn: str
     pvElec: float
     useElec: float
     buyElec: float
     sellElec: float
-    chargeElec: float
-    dischargeElec: float
+    chargeElec: None | float
+    dischargeElec: None | float
     buyRate: str
     sellRate: str
-    selfConsumedRate1: str
-    selfConsumedRate2: str
-    selfConsumedEnergy1: float
-    selfConsumedEnergy2: float
-    plantTreeNum: float
-    reduceCo2: float
-    dataTime: None | int
-    devicesn: str
 
 
 class ESolarPlantDetail(TypedDict):
-    """API response for platDetail."""
+    """Decoded plantDetail."""
 
     type: int
-    runningState: int
-    nowPower: float
-    todayElectricity: float
-    monthElectricity: float
-    yearElectricity: float
-    totalElectricity: float
-    totalConsumpElec: None | float
-    totalBuyElec: None | float
-    totalSellElec: None | float
-    selfUseRate: None | str
     income: None | float
-    todayGridIncome: None | float
-    devOnlineNum: int
-    devTotalNum: int
-    totalPlantTreeNum: float
     totalReduceCo2: float
-    todayAlarmNum: None | int
+    totalPlantTreeNum: float
+    totalBuyElec: None | float
+    totalSellElec: None | float
     lastUploadTime: str
-    userType: int
     snList: list[str]
-    energyCompareYearList: list[str]
 
 
 class ESolarPeakList(TypedDict):
-    """API response for peakList."""
+    """Decoded peakList entry."""
 
     devicesn: str
-    peakPower: float
+    peakPower: None | float
 
 
 class ESolarPlantList(TypedDict):
-    """API response for plantList."""
+    """Decoded plantList entry, with the records of the other endpoints."""
 
     plantuid: str
     plantname: str
-    systempower: float
+    systempower: None | float
     currency: str
     type: int
-    installername: str
-    countryCode: str
     country: str
-    province: str
-    city: str
-    county: str
-    foreignRemark: str
     address: str
-    latitude: float
-    longitude: float
-    createDateStr: str
-    isOnline: str
+    latitude: None | float
+    longitude: None | float
     runningState: int
-    nowPower: float
-    todayElectricity: float
-    totalElectricity: float
-    enableEdit: str
-    enableDelete: str
-    enableVisitor: str
-    isFavorite: str
-    isRename: int
-    isMulBind: int
-    isTimeError: int
+    nowPower: None | float
+    todayElectricity: None | float
+    totalElectricity: None | float
     plantDetail: ESolarPlantDetail
-    status: str
     peakList: None | list[ESolarPeakList]
     kitList: None | list[ESolarKitList]
     beanList: None | list[ESolarBeanList]
@@ -406,32 +236,273 @@ class ESolarResponse(TypedDict):
     plantList: list[ESolarPlantList]
 
 
+class ESolarPlantAggregates(TypedDict):
+    """Plant level values computed from the lists of a plant."""
+
+    peakPower: None | float
+    chargeElec: float
+    dischargeElec: float
+    batEnergyPercent: None | float
+
+
+class ESolarIndex:
+    """Plants by plantuid, devices and beans by devicesn, for one update.
+
+    The plant level aggregates are computed here as well, in one pass over the
+    kitList, beanList and peakList of every plant. Compared with the index of
+    the previous update, changed_plants and changed_devices hold the plants and
+    devices whose values differ, so unchanged entities can skip their update.
+    """
+
+    def __init__(
+        self, data: ESolarResponse, previous: ESolarIndex | None = None
+    ) -> None:
+        """Index the plant list."""
+        self.plants: dict[str, ESolarPlantList] = {}
+        self.devices: dict[str, ESolarKitList] = {}
+        self.beans: dict[str, ESolarBeanList] = {}
+        self.aggregates: dict[str, ESolarPlantAggregates] = {}
+        self.plant_values: dict[str, tuple[dict[str, Any], ESolarPlantAggregates]] = {}
+        for plant in data["plantList"]:
+            self.plants[plant["plantuid"]] = plant
+            for kit in plant.get("kitList") or []:
+                self.devices[kit["devicesn"]] = kit
+            for bean in plant.get("beanList") or []:
+                self.beans[bean["devicesn"]] = bean
+            self.aggregates[plant["plantuid"]] = aggregate_plant(plant)
+            values = {
+                key: value for key, value in plant.items() if key not in PLANT_LISTS
+            }
+            self.plant_values[plant["plantuid"]] = (
+                values,
+                self.aggregates[plant["plantuid"]],
+            )
+
+        if previous is None:
+            self.changed_plants = set(self.plants)
+            self.changed_devices = self.devices.keys() | self.beans.keys()
+            return
+        self.changed_plants = changed_keys(self.plant_values, previous.plant_values)
+        self.changed_devices = changed_keys(self.devices, previous.devices)
+        self.changed_devices |= changed_keys(self.beans, previous.beans)
+
+
+def changed_keys(current: Mapping[str, Any], previous: Mapping[str, Any]) -> set[str]:
+    """Return the keys that were added, removed or have a different value."""
+    return {
+        key
+        for key in current.keys() | previous.keys()
+        if current.get(key) != previous.get(key)
+    }
+
+
+def aggregate_plant(plant: ESolarPlantList) -> ESolarPlantAggregates:
+    """Compute the plant level values of one plant."""
+    peak_power = None
+    if plant["type"] == 0 and "peakList" in plant:
+        peak_power = float(0)
+        for peak in plant["peakList"] or []:
+            peak_power += peak["peakPower"] or 0
+
+    charge = float(0)
+    discharge = float(0)
+    for bean in plant.get("beanList") or []:
+        charge += bean["chargeElec"] or 0
+        discharge += bean["dischargeElec"] or 0
+
+    # State of charge weighted by the capacity of the online batteries
+    installed_power = float(0)
+    available_power = float(0)
+    if "plantDetail" in plant:
+        inverters = set(plant["plantDetail"]["snList"])
+        for kit in plant.get("kitList") or []:
+            if kit["devicesn"] not in inverters or kit["onLineStr"] != "1":
+                continue
+            power = kit.get("storeDevicePower")
+            if power is None:
+                continue
+            installed_power += power["batCapcity"] or 0
+            available_power += (power["batCapcity"] or 0) * (
+                power["batEnergyPercent"] or 0
+            )
+    soc = None
+    if installed_power > 0:
+        soc = float(available_power / installed_power)
+
+    return ESolarPlantAggregates(
+        peakPower=peak_power,
+        chargeElec=charge,
+        dischargeElec=discharge,
+        batEnergyPercent=soc,
+    )
+
+
+class ESolarUploadClock:
+    """Upload cadence and phase of one device, learned from its upload times.
+
+    The cadence is the shortest of the recent differences between two upload
+    times, so it grows back once a shorter difference is no longer seen. The
+    phase is the newest upload time. Upload times in the local time of the
+    plant keep the phase right as long as the cadence divides the difference
+    to the Home Assistant time zone.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.last: datetime | None = None
+        self.cadence: timedelta | None = None
+        self._differences: deque[timedelta] = deque(maxlen=UPLOAD_CADENCE_SAMPLES)
+
+    def observe(self, upload: datetime) -> None:
+        """Learn from the newest upload time of an update."""
+        if self.last is not None and upload > self.last:
+            difference = upload - self.last
+            if MIN_UPLOAD_CADENCE <= difference <= MAX_UPLOAD_CADENCE:
+                self._differences.append(difference)
+                self.cadence = min(self._differences)
+        if self.last is None or upload > self.last:
+            self.last = upload
+
+    def next_upload(self, after: datetime) -> datetime | None:
+        """Return the first expected upload at or after a point in time."""
+        if self.last is None or self.cadence is None:
+            return None
+        return self.last - ((self.last - after) // self.cadence) * self.cadence
+
+
+def upload_times(plant: ESolarPlantList) -> dict[str, datetime]:
+    """Return the newest upload time of every device, from its most precise source.
+
+    The dataTime of the storeDevicePower is a UTC timestamp, the timeStart of
+    the raw data is in local time. The lastUploadTime of the plant is not
+    used, it is metadata that is only refreshed at the metadata interval.
+    """
+    uploads = {}
+    for kit in plant.get("kitList") or []:
+        if (power := kit.get("storeDevicePower")) and power.get("dataTime"):
+            upload = dt_util.utc_from_timestamp(power["dataTime"] / 1000)
+        elif (raw := kit.get("findRawdataPageList")) and raw["timeStart"]:
+            if (parsed := dt_util.parse_datetime(raw["timeStart"])) is None:
+                continue
+            upload = dt_util.as_utc(parsed)
+        else:
+            continue
+        uploads[kit["devicesn"]] = upload
+    return uploads
+
+
+def is_producing(plant: ESolarPlantList) -> bool:
+    """Return whether a plant reports power or has an online inverter."""
+    if plant["nowPower"]:
+        return True
+    return any(
+        kit["onLineStr"] == "1" or kit["powernow"]
+        for kit in plant.get("kitList") or []
+    )
+
+
+@callback
+def async_get_rate_limiter(
+    hass: HomeAssistant, region: str, username: str
+) -> RateLimiter:
+    """Return the rate limiter of an account, shared by all its portal sessions."""
+    limiters: dict[tuple[str, str], RateLimiter] = hass.data.setdefault(
+        DATA_RATE_LIMITERS, {}
+    )
+    if (limiter := limiters.get((region, username))) is None:
+        limiter = limiters[(region, username)] = RateLimiter()
+    return limiter
+
+
 async def update_listener(hass, entry):
     """Handle options update."""
     _LOGGER.debug(entry.options)
+    coordinator: ESolarCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_update_intervals()
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up eSolar from a config entry."""
     coordinator = ESolarCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_restore_session()
+    warm_start = await coordinator.async_restore_snapshot()
+    if not warm_start:
+        try:
+            await coordinator.metadata.async_config_entry_first_refresh()
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_close()
+            raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     entry.async_on_unload(entry.add_update_listener(update_listener))
+    # The metadata coordinator only polls while somebody listens to it
+    entry.async_on_unload(
+        coordinator.metadata.async_add_listener(coordinator.async_metadata_updated)
+    )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if warm_start:
+        # Entities already show the snapshot, fetch fresh data behind them
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.entry_id} refresh"
+        )
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: ESolarCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted session and snapshot of a deleted config entry."""
+    for key in (STORAGE_KEY_SESSION, STORAGE_KEY_SNAPSHOT):
+        await Store(hass, STORAGE_VERSION, key.format(entry.entry_id)).async_remove()
+
+
+class ESolarMetadataCoordinator(DataUpdateCoordinator[ESolarResponse]):
+    """Metadata update coordinator for plants, their snList and their devices."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, session: ESolarSession
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} metadata",
+            update_interval=timedelta(
+                minutes=entry.options.get(
+                    CONF_METADATA_INTERVAL, DEFAULT_METADATA_INTERVAL
+                )
+            ),
+        )
+        self._entry = entry
+        self._session = session
+
+    async def _async_update_data(self) -> ESolarResponse:
+        """Fetch the latest metadata from the source."""
+        # Live data requests of the account go through the rate limiter first
+        priority = REQUEST_PRIORITY.set(PRIORITY_METADATA)
+        try:
+            return await get_metadata(
+                self.hass, self._session, self._entry.data, self._entry.options
+            )
+        except InvalidAuth as err:
+            raise ConfigEntryAuthFailed from err
+        except ESolarError as err:
+            raise UpdateFailed(str(err)) from err
+        finally:
+            REQUEST_PRIORITY.reset(priority)
+
+
 class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
-    """Data update coordinator."""
+    """Live data update coordinator, built on top of the metadata coordinator."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
@@ -439,28 +510,263 @@ class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=CONF_UPDATE_INTERVAL),
-            # update_interval=timedelta(seconds=20),
+            update_interval=timedelta(
+                minutes=entry.options.get(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL)
+            ),
         )
         self._entry = entry
         self.temp = 3
+        # Long-lived login; the keep-alive pool is sized to the fan-out limit
+        max_concurrency = entry.options.get(
+            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        )
+        websession = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=max_concurrency, ssl=ssl_util.client_context()
+            ),
+        )
+        self._session = ESolarSession(
+            websession,
+            entry.data.get(CONF_REGION),
+            entry.data.get(CONF_USERNAME),
+            entry.data.get(CONF_PASSWORD),
+            max_concurrency,
+            async_get_rate_limiter(
+                hass, entry.data.get(CONF_REGION), entry.data.get(CONF_USERNAME)
+            ),
+        )
+        self._session_store: Store = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SESSION.format(entry.entry_id)
+        )
+        self._stored_login_generation = 0
+        self._snapshot_store: Store = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(entry.entry_id)
+        )
+        self.metadata = ESolarMetadataCoordinator(hass, entry, self._session)
+        self.index = ESolarIndex({"plantList": []})
+        # Longest time a sensor may hold back a change within its deadband
+        self.heartbeat: timedelta | None = None
+        self._live_interval = self.update_interval
+        self._night_interval = self.update_interval
+        self._locations: dict[tuple[float, float], Location] = {}
+        # ESolarUploadClock by devicesn
+        self._upload_clocks: dict[str, ESolarUploadClock] = {}
+        self.async_update_intervals()
 
     @property
     def entry_id(self) -> str:
         """Return entry ID."""
         return self._entry.entry_id
 
+    async def async_close(self) -> None:
+        """Close the portal session."""
+        await self._session.async_close()
+
+    @callback
+    def async_update_intervals(self) -> None:
+        """Apply the update intervals of the options."""
+        self._live_interval = timedelta(
+            minutes=self._entry.options.get(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL)
+        )
+        self._night_interval = timedelta(
+            minutes=self._entry.options.get(
+                CONF_NIGHT_INTERVAL, DEFAULT_NIGHT_INTERVAL
+            )
+        )
+        self.update_interval = self._live_interval
+        self.metadata.update_interval = timedelta(
+            minutes=self._entry.options.get(
+                CONF_METADATA_INTERVAL, DEFAULT_METADATA_INTERVAL
+            )
+        )
+        self.heartbeat = (
+            timedelta(
+                minutes=self._entry.options.get(
+                    CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                )
+            )
+            if self._entry.options.get(CONF_DEADBAND, True)
+            else None
+        )
+
+    @callback
+    def _plant_location(self, plant: ESolarPlantList) -> Location:
+        """Return the location of a plant, or of Home Assistant if it has none."""
+        latitude, longitude = plant.get("latitude"), plant.get("longitude")
+        if latitude is None or longitude is None:
+            return get_astral_location(self.hass)[0]
+        if (location := self._locations.get((latitude, longitude))) is None:
+            time_zone = str(self.hass.config.time_zone)
+            location = self._locations[(latitude, longitude)] = Location(
+                LocationInfo("", "", time_zone, latitude, longitude)
+            )
+        return location
+
+    @callback
+    def _next_interval(self, data: ESolarResponse) -> timedelta:
+        """Return the night interval while nothing produces, else the live one.
+
+        It is night for a plant between dusk and dawn at its own location. The
+        night interval only applies while every plant is at night and reports
+        neither power nor an online inverter, and is cut short at the first
+        dawn, so polling is back at full speed when production starts.
+        """
+        now = dt_util.utcnow()
+        if self._night_interval <= self._live_interval:
+            return self._upload_interval(now)
+        next_dawn = now + self._night_interval
+        for plant in data["plantList"]:
+            if is_producing(plant):
+                return self._upload_interval(now)
+            location = self._plant_location(plant)
+            try:
+                dawn = get_location_astral_event_next(location, 0, "dawn", now)
+                dusk = get_location_astral_event_next(location, 0, "dusk", now)
+            except ValueError:
+                # No twilight at this time of year, polar day or night
+                return self._upload_interval(now)
+            if dusk < dawn:
+                return self._upload_interval(now)
+            next_dawn = min(next_dawn, dawn)
+        return max(self._live_interval, next_dawn - now)
+
+    @callback
+    def _upload_interval(self, now: datetime) -> timedelta:
+        """Return the time until just after the next expected upload.
+
+        For every device the last upload expected within a live interval is
+        taken. Polling locks on to the uploads that fall together for the most
+        devices, the devices of staggered plants are picked up by the same
+        polls a little later. The time is capped at the live interval, so
+        after locking on polling is neither more nor less frequent than the
+        live interval.
+        """
+        uploads = {
+            devicesn: upload
+            for devicesn, clock in self._upload_clocks.items()
+            if clock.cadence is not None
+            and (
+                upload := clock.next_upload(
+                    max(now, now + self._live_interval - UPLOAD_DELAY - clock.cadence)
+                )
+            )
+            is not None
+        }
+        if not uploads:
+            return self._live_interval
+
+        def phase(devicesn: str) -> list[datetime]:
+            return [
+                upload
+                for upload in uploads.values()
+                if abs(upload - uploads[devicesn]) <= UPLOAD_DELAY
+            ]
+
+        # Sorted, ties go to the same device on every poll
+        locked = max(sorted(uploads), key=lambda devicesn: len(phase(devicesn)))
+        return min(max(phase(locked)) + UPLOAD_DELAY - now, self._live_interval)
+
+    @callback
+    def async_metadata_updated(self) -> None:
+        """Handle updated metadata, it is merged in by the next live refresh."""
+        _LOGGER.debug("Metadata updated for %s", self.entry_id)
+
+    async def async_restore_session(self) -> None:
+        """Restore the portal cookies persisted by a previous run."""
+        if (stored := await self._session_store.async_load()) is None:
+            return
+        if stored.get("region") != self._session.region or stored.get(
+            "username"
+        ) != self._session.username:
+            return
+        if self._session.restore_cookies(stored["cookies"]):
+            _LOGGER.debug("Restored portal session, skipping login")
+
+    async def async_restore_snapshot(self) -> bool:
+        """Publish the last good data of a previous run, if it is still usable."""
+        if (stored := await self._snapshot_store.async_load()) is None:
+            return False
+        # Entities are created from the data, so it must match the options
+        if stored.get("format") != SNAPSHOT_FORMAT:
+            return False
+        if stored.get("options") != self._snapshot_options():
+            return False
+        _LOGGER.debug("Warm start from snapshot taken %s", stored["updated"])
+        # The live data holds everything the metadata does
+        data = cast(ESolarResponse, stored["data"])
+        self.metadata.async_set_updated_data(data)
+        self.index = ESolarIndex(data, self.index)
+        self.async_set_updated_data(data)
+        return True
+
+    def _snapshot_options(self) -> dict[str, Any]:
+        """Return the options a snapshot depends on."""
+        return {
+            key: self._entry.options[key]
+            for key in SNAPSHOT_OPTIONS
+            if key in self._entry.options
+        }
+
+    @callback
+    def _snapshot_to_store(self) -> dict[str, Any]:
+        """Return the current data for the snapshot store."""
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "updated": dt_util.utcnow().isoformat(),
+            "options": self._snapshot_options(),
+            "data": self.data,
+        }
+
+    async def _async_save_session(self) -> None:
+        """Persist the portal cookies after a new login."""
+        if self._session.login_generation == self._stored_login_generation:
+            return
+        self._stored_login_generation = self._session.login_generation
+        await self._session_store.async_save(
+            {
+                "region": self._session.region,
+                "username": self._session.username,
+                "cookies": self._session.export_cookies(),
+            }
+        )
+
     async def _async_update_data(self) -> ESolarResponse:
         """Fetch the latest data from the source."""
+        if self.metadata.data is None:
+            await self.metadata.async_refresh()
+            if self.metadata.data is None:
+                raise UpdateFailed("No plant metadata available")
+
         try:
-            data = await self.hass.async_add_executor_job(
-                get_data, self.hass, self._entry.data, self._entry.options
+            data = await get_data(
+                self.hass,
+                self._session,
+                self._entry.data,
+                self._entry.options,
+                self.metadata.data,
+                self.data,
             )
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
         except ESolarError as err:
             raise UpdateFailed(str(err)) from err
 
+        if len(data["plantList"]) != len(self.metadata.data["plantList"]):
+            _LOGGER.debug("Plant list changed, refreshing metadata")
+            await self.metadata.async_request_refresh()
+
+        await self._async_save_session()
+        self._snapshot_store.async_delay_save(
+            self._snapshot_to_store, SNAPSHOT_SAVE_DELAY
+        )
+        # Built once here, the entities look up their plant and device in it
+        self.index = ESolarIndex(data, self.index)
+        for plant in data["plantList"]:
+            for devicesn, upload in upload_times(plant).items():
+                self._upload_clocks.setdefault(devicesn, ESolarUploadClock()).observe(
+                    upload
+                )
+        self.update_interval = self._next_interval(data)
         return data
 
 
@@ -480,34 +786,78 @@ class UnknownError(ESolarError):
     """Raised when an unknown error occurs."""
 
 
-def get_data(
-    hass: HomeAssistant, config: Mapping[str, Any], options: Mapping[str, Any]
+async def get_metadata(
+    hass: HomeAssistant,
+    session: ESolarSession,
+    config: Mapping[str, Any],
+    options: Mapping[str, Any],
 ) -> ESolarResponse:
-    """Get data from the API."""
+    """Get plant, inverter and device metadata from the API."""
 
     username = config.get(CONF_USERNAME)
-    password = config.get(CONF_PASSWORD)
     region = config.get(CONF_REGION)
     plants = options.get(CONF_MONITORED_SITES)
-    use_pv_grid_attributes = options.get(CONF_PV_GRID_DATA)
+    plant_list_only = options.get(CONF_PLANT_LIST_ONLY, False)
+    account_device_list = options.get(CONF_ACCOUNT_DEVICE_LIST, False)
+
+    _LOGGER.debug(
+        "Fetching metadata with username %s, for plants %s", username, plants
+    )
+    return await async_call_api(
+        get_esolar_metadata(
+            region, session, plants, plant_list_only, account_device_list
+        )
+    )
 
-    try:
-        _LOGGER.debug(
-            "Fetching data with username %s, for plants %s with pv attributes set to %s",
-            username,
-            plants,
+
+async def get_data(
+    hass: HomeAssistant,
+    session: ESolarSession,
+    config: Mapping[str, Any],
+    options: Mapping[str, Any],
+    metadata: ESolarResponse,
+    previous: ESolarResponse | None = None,
+) -> ESolarResponse:
+    """Get live data from the API for the plants of the metadata."""
+
+    username = config.get(CONF_USERNAME)
+    region = config.get(CONF_REGION)
+    use_pv_grid_attributes = options.get(CONF_PV_GRID_DATA)
+    use_inverter_sensors = options.get(CONF_INVERTER_SENSORS)
+    plant_list_only = options.get(CONF_PLANT_LIST_ONLY, False)
+    account_device_list = options.get(CONF_ACCOUNT_DEVICE_LIST, False)
+    # Endpoints back off from the live interval while their values are unchanged
+    endpoint_intervals = (
+        options.get(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL) * 60,
+        options.get(CONF_MAX_ENDPOINT_INTERVAL, DEFAULT_MAX_ENDPOINT_INTERVAL) * 60,
+    )
+
+    _LOGGER.debug(
+        "Fetching data with username %s, for plants %s with pv attributes set to %s",
+        username,
+        [plant["plantname"] for plant in metadata["plantList"]],
+        use_pv_grid_attributes,
+    )
+    return await async_call_api(
+        get_esolar_live_data(
+            region,
+            session,
+            metadata,
             use_pv_grid_attributes,
+            use_inverter_sensors,
+            plant_list_only,
+            account_device_list,
+            previous,
+            endpoint_intervals,
         )
-        plant_info = get_esolar_data(region, username, password, plants, use_pv_grid_attributes)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+    )
+
+
+async def async_call_api(request: Awaitable[dict[str, Any]]) -> ESolarResponse:
+    """Await an eSolar request and translate its failures."""
+    try:
+        plant_info = await request
+
     except ValueError as err:
         err_str = str(err)
 
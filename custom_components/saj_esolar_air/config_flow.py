@@ -1,10 +1,11 @@
 """Config flow for eSolar integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-import requests
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -13,14 +14,36 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
+from . import async_get_rate_limiter
 from .const import (
+    CONF_ACCOUNT_DEVICE_LIST,
+    CONF_DEADBAND,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_INVERTER_SENSORS,
+    CONF_LIVE_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_ENDPOINT_INTERVAL,
+    CONF_METADATA_INTERVAL,
     CONF_MONITORED_SITES,
+    CONF_NIGHT_INTERVAL,
+    CONF_PLANT_LIST_ONLY,
     CONF_PV_GRID_DATA,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
+    DEFAULT_MAX_ENDPOINT_INTERVAL,
+    DEFAULT_METADATA_INTERVAL,
+    DEFAULT_NIGHT_INTERVAL,
     DOMAIN,
 )
-from .esolar import esolar_web_autenticate, web_get_plant
+from .esolar import (
+    DEFAULT_MAX_CONCURRENCY,
+    PRIORITY_SETUP,
+    REQUEST_PRIORITY,
+    ESolarSession,
+    web_get_plant,
+)
 
 CONF_TITLE = "SAJ eSolar"
 
@@ -42,22 +65,26 @@ class ESolarHub:
         """Initialize."""
         self.plant_list: dict[str, Any] = {}
 
-    def auth_and_get_solar_plants(self, region: str, username: str, password: str) -> bool:
+    async def auth_and_get_solar_plants(self, session: ESolarSession) -> bool:
         """Download and list availablse inverters."""
         try:
-            session = esolar_web_autenticate(region, username, password)
-            self.plant_list = web_get_plant(region, session).get("plantList")
-        except requests.exceptions.HTTPError:
+            self.plant_list = (await web_get_plant(session.region, session)).get(
+                "plantList"
+            )
+        except aiohttp.ClientResponseError:
             _LOGGER.error("Login: HTTPError")
             return False
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             _LOGGER.error("Login: ConnectionError")
             return False
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             _LOGGER.error("Login: Timeout")
             return False
-        except requests.exceptions.RequestException:
-            _LOGGER.error("Login: RequestException")
+        except aiohttp.ClientError:
+            _LOGGER.error("Login: ClientError")
+            return False
+        except ValueError:
+            _LOGGER.error("Login: Invalid authentication credentials")
             return False
         return True
 
@@ -66,13 +93,24 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate that the user input allows us to connect and fetch list of sites."""
 
     hub = ESolarHub()
-    if not await hass.async_add_executor_job(
-        hub.auth_and_get_solar_plants,
-        data[CONF_REGION],
-        data[CONF_USERNAME],
-        data[CONF_PASSWORD]
-    ):
-        raise InvalidAuth
+    websession = async_create_clientsession(hass, auto_cleanup=False)
+    priority = REQUEST_PRIORITY.set(PRIORITY_SETUP)
+    try:
+        if not await hub.auth_and_get_solar_plants(
+            ESolarSession(
+                websession,
+                data[CONF_REGION],
+                data[CONF_USERNAME],
+                data[CONF_PASSWORD],
+                limiter=async_get_rate_limiter(
+                    hass, data[CONF_REGION], data[CONF_USERNAME]
+                ),
+            )
+        ):
+            raise InvalidAuth
+    finally:
+        REQUEST_PRIORITY.reset(priority)
+        websession.detach()
     return {"plant_list": hub.plant_list}
 
 
@@ -197,6 +235,58 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_PV_GRID_DATA,
                         default=self.config_entry.options.get(CONF_PV_GRID_DATA),
                     ): bool,
+                    vol.Required(
+                        CONF_PLANT_LIST_ONLY,
+                        default=self.config_entry.options.get(
+                            CONF_PLANT_LIST_ONLY, False
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_ACCOUNT_DEVICE_LIST,
+                        default=self.config_entry.options.get(
+                            CONF_ACCOUNT_DEVICE_LIST, False
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Required(
+                        CONF_LIVE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Required(
+                        CONF_METADATA_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_METADATA_INTERVAL, DEFAULT_METADATA_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=1440)),
+                    vol.Required(
+                        CONF_NIGHT_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_NIGHT_INTERVAL, DEFAULT_NIGHT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=240)),
+                    vol.Required(
+                        CONF_MAX_ENDPOINT_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_ENDPOINT_INTERVAL, DEFAULT_MAX_ENDPOINT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Required(
+                        CONF_DEADBAND,
+                        default=self.config_entry.options.get(CONF_DEADBAND, True),
+                    ): bool,
+                    vol.Required(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=240)),
                 }
             ),
         )
@@ -3,12 +3,33 @@ from typing import Final
 
 DOMAIN = "saj_esolar_air"
 CONF_MONITORED_SITES = "monitored_sites"
-CONF_UPDATE_INTERVAL = 5
+STORAGE_VERSION = 1
+STORAGE_KEY_SESSION = DOMAIN + ".session.{}"
+STORAGE_KEY_SNAPSHOT = DOMAIN + ".snapshot.{}"
+# Rate limiters by (region, username), shared by entries and config flows
+DATA_RATE_LIMITERS = DOMAIN + "_rate_limiters"
+SNAPSHOT_SAVE_DELAY = 60
 ATTRIBUTION = "Data provided by SAJ eSolar"
 MANUFACTURER = "SAJ"
 
 CONF_INVERTER_SENSORS: Final = "show_inverter_sensors"
 CONF_PV_GRID_DATA: Final = "show_pv_grid_data"
+CONF_MAX_CONCURRENCY: Final = "max_concurrent_requests"
+CONF_LIVE_INTERVAL: Final = "live_update_interval"
+CONF_METADATA_INTERVAL: Final = "metadata_update_interval"
+CONF_NIGHT_INTERVAL: Final = "night_update_interval"
+CONF_MAX_ENDPOINT_INTERVAL: Final = "max_endpoint_interval"
+CONF_PLANT_LIST_ONLY: Final = "plant_list_only"
+CONF_ACCOUNT_DEVICE_LIST: Final = "account_device_list"
+CONF_DEADBAND: Final = "deadband_filter"
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
+
+# Update intervals in minutes
+DEFAULT_LIVE_INTERVAL = 5
+DEFAULT_METADATA_INTERVAL = 60
+DEFAULT_NIGHT_INTERVAL = 60
+DEFAULT_MAX_ENDPOINT_INTERVAL = 60
+DEFAULT_HEARTBEAT_INTERVAL = 30
 
 # Misc
 P_UNKNOWN = "Unknown"
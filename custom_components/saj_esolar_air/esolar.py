@@ -1,14 +1,166 @@
 """ESolar Cloud Platform data fetchers."""
+import asyncio
 import calendar
+import contextvars
 import datetime
 from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from functools import partial
+import hashlib
+import heapq
+from http.cookies import SimpleCookie
+import itertools
+import json
 import logging
+import time
+from urllib.parse import parse_qsl
 
-import requests
+import aiohttp
+from yarl import URL
 
 _LOGGER = logging.getLogger(__name__)
 
 WEB_TIMEOUT = 10
+DEFAULT_MAX_CONCURRENCY = 4
+DEVICE_PAGE_SIZE = 100
+MAX_DEVICE_PAGES = 50
+# Decoded responses kept to short-circuit byte-identical bodies
+RESPONSE_CACHE_SIZE = 512
+DEVICE_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+}
+# Plant keys filled in by the live endpoints whose interval adapts to changes
+ADAPTIVE_ENDPOINTS = {
+    "chart": ("peakList", "beanList"),
+    "detail": ("plantDetail",),
+    "devices": ("kitList",),
+}
+# getUserPlantList values that make every adaptive endpoint of a plant due
+PLANT_ACTIVITY_FIELDS = ("nowPower", "runningState")
+# Seconds an endpoint may be polled early, polls do not come exactly on time
+ENDPOINT_SLACK = 60
+# Requests per second and burst of the portal requests of one account
+RATE_LIMIT_PER_SECOND = 2
+RATE_LIMIT_BURST = 20
+# Order in which queued requests get through the rate limiter
+PRIORITY_LIVE = 0
+PRIORITY_SETUP = 1
+PRIORITY_METADATA = 2
+# Priority of the portal requests made by the current task and its children
+REQUEST_PRIORITY = contextvars.ContextVar(
+    "esolar_request_priority", default=PRIORITY_LIVE
+)
+
+
+def number(value):
+    """SAJ eSolar Helper Function - Parse a numeric field, None if it is not one."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# The fields kept from each portal record, with the decoder of numeric fields.
+# Everything else in a response is dropped as soon as it is decoded.
+PLANT_FIELDS = {
+    "plantuid": None,
+    "plantname": None,
+    "systempower": number,
+    "currency": None,
+    "type": None,
+    "country": None,
+    "address": None,
+    "latitude": number,
+    "longitude": number,
+    "runningState": None,
+    "nowPower": number,
+    "todayElectricity": number,
+    "totalElectricity": number,
+}
+PLANT_DETAIL_FIELDS = {
+    "type": None,
+    "income": None,
+    "totalReduceCo2": None,
+    "totalPlantTreeNum": None,
+    "totalBuyElec": number,
+    "totalSellElec": number,
+    "lastUploadTime": None,
+    "snList": None,
+}
+PEAK_FIELDS = {"devicesn": None, "peakPower": number}
+BEAN_FIELDS = {
+    "devicesn": None,
+    "pvElec": None,
+    "useElec": None,
+    "buyElec": None,
+    "sellElec": None,
+    "chargeElec": number,
+    "dischargeElec": number,
+    "buyRate": None,
+    "sellRate": None,
+}
+DEVICE_FIELDS = {
+    "devicesn": None,
+    "type": None,
+    "devicetype": None,
+    "devicepc": None,
+    "displayfw": None,
+    "mastermcufw": None,
+    "kitSn": None,
+    "onLineStr": None,
+    "powernow": number,
+    "todaySellEnergy": number,
+    "monthSellEnergy": number,
+    "totalSellEnergy": number,
+}
+RAWDATA_FIELDS = {
+    "timeStart": None,
+    "deviceType": None,
+    **{
+        f"pV{pv}{value}": number
+        for pv in (1, 2, 3)
+        for value in ("Volt", "Curr")
+    },
+    **{
+        f"{phase}{value}": number
+        for phase in "rst"
+        for value in (
+            "GridVolt",
+            "GridCurr",
+            "GridFreq",
+            "GridPowerWatt",
+            "GridPowerVA",
+            "OutVolt",
+            "OutCurr",
+            "OutPowerWatt",
+            "OutPowerVA",
+            "OutFreq",
+            "OnGridOutVolt",
+            "OnGridOutPowerWatt",
+        )
+    },
+    "rOnGridOutFreq": number,
+    "rBackupPowerWatt": number,
+}
+STORE_DEVICE_POWER_FIELDS = {
+    "batCapcity": number,
+    "batCapcityStr": None,
+    "batEnergyPercent": number,
+    "batCurr": number,
+    "batteryPower": number,
+    "batteryDirection": None,
+    "gridPower": number,
+    "gridDirection": None,
+    "inputOutputPower": number,
+    "outPutDirection": None,
+    "pvPower": number,
+    "pvDirection": None,
+    "totalLoadPower": number,
+    "homeLoadPower": number,
+    "backupLoadPower": number,
+    "solarPower": number,
+    "dataTime": None,
+}
 
 BASIC_TEST = False
 VERBOSE_DEBUG = False
@@ -56,71 +208,637 @@ def add_years(source_date, years):
         )
 
 
-def get_esolar_data(region, username, password, plant_list=None, use_pv_grid_attributes=True):
+def decode(record, fields):
+    """SAJ eSolar Helper Function - Keep the known fields of a record, decoded."""
+    return {
+        field: record[field] if decoder is None else decoder(record[field])
+        for field, decoder in fields.items()
+        if field in record
+    }
+
+
+def decode_plant_detail(response):
+    """SAJ eSolar Helper Function - Decode a getPlantDetailInfo response."""
+    return decode(response["plantDetail"], PLANT_DETAIL_FIELDS)
+
+
+def decode_rawdata(response):
+    """SAJ eSolar Helper Function - Row count and newest row of findRawdataPageList."""
+    rows = response["list"]
+    if len(rows) > 1:
+        # A whole day of rows, in no particular order
+        newest = max(rows, key=lambda row: row.get("timeStart") or "")
+    else:
+        newest = rows[0] if rows else None
+    if newest is not None:
+        newest = decode(newest, RAWDATA_FIELDS)
+    return len(rows), newest
+
+
+def decode_store_device_power(response):
+    """SAJ eSolar Helper Function - Decode a getStoreOrAcDevicePowerInfo response."""
+    return decode(response["storeDevicePower"], STORE_DEVICE_POWER_FIELDS)
+
+
+def response_key(url, data):
+    """SAJ eSolar Helper Function - Endpoint and parameters, without cache buster."""
+    url = URL(url)
+    params = list(url.query.items())
+    if isinstance(data, str):
+        params.extend(parse_qsl(data, keep_blank_values=True))
+    elif data:
+        params.extend(data.items())
+    return url.path, tuple(
+        sorted((key, str(value)) for key, value in params if key != "_")
+    )
+
+
+def epoch_milliseconds():
+    """SAJ eSolar Helper Function - Milliseconds since epoch, used as cache buster."""
+    return round(
+        int(
+            (
+                datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)
+            ).total_seconds()
+            * 1000
+        )
+    )
+
+
+async def gather_or_cancel(*aws):
+    """SAJ eSolar Helper Function - Gather awaitables, cancel the rest if one fails."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+class EndpointSchedule:
+    """Refresh interval of one live endpoint, from how often its result changes.
+
+    The interval doubles every time a fetch returns the same result as before,
+    up to the maximum interval, and drops back to the minimum interval as
+    soon as the result changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the schedule, the endpoint is due right away."""
+        self.interval = 0.0
+        self.fetched_at = None
+
+    def due(self, now):
+        """Return whether the endpoint should be fetched at a monotonic time."""
+        return (
+            self.fetched_at is None
+            or now - self.fetched_at >= self.interval - ENDPOINT_SLACK
+        )
+
+    def fetched(self, now, changed, min_interval, max_interval):
+        """Adapt the interval to a fetch of the endpoint."""
+        self.fetched_at = now
+        if changed:
+            self.interval = min_interval
+        else:
+            self.interval = min(max(self.interval * 2, min_interval), max_interval)
+
+
+class RateLimiter:
+    """Token bucket for the portal requests of one account.
+
+    Requests that find the bucket empty queue up and are let through in order
+    of REQUEST_PRIORITY, then in order of arrival, as tokens are refilled.
+    """
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST) -> None:
+        """Initialize the limiter with a full bucket."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._order = itertools.count()
+        self._wakeup = None
+
+    def _refill(self):
+        """Add the tokens of the time since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token, with the priority of the current task."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (REQUEST_PRIORITY.get(), next(self._order), future)
+        )
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was granted to a request that will not be made
+                self._tokens += 1
+                self._release_waiters()
+            raise
+
+    def _schedule_wakeup(self):
+        """Wake up when the next token is available for the first waiter."""
+        if not self._waiters or self._wakeup is not None:
+            return
+        self._wakeup = asyncio.get_running_loop().call_later(
+            max(0, (1 - self._tokens) / self._rate), self._wakeup_waiters
+        )
+
+    def _wakeup_waiters(self):
+        """Let the waiters through that the refilled tokens allow."""
+        self._wakeup = None
+        self._release_waiters()
+
+    def _release_waiters(self):
+        """Grant tokens to the queued requests, highest priority first."""
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule_wakeup()
+
+
+class ESolarSession:
+    """SAJ eSolar WEB Portal session, logged in once and reused across polls.
+
+    The portal is only asked to log in again when it answers a request with a
+    401, a redirect to the login page or a non-JSON login page.
+    """
+
+    def __init__(
+        self,
+        websession: aiohttp.ClientSession,
+        region,
+        username,
+        password,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        limiter=None,
+    ) -> None:
+        """Initialize the session."""
+        self.websession = websession
+        self.region = region
+        self.username = username
+        self.password = password
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Shared with the other sessions of the account, if any
+        self._limiter = limiter
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
+        self.authenticated = False
+        # Plant types whose chart can not be fetched for several inverters
+        self.unbatched_chart_types: set[int] = set()
+        # Plant types whose batched peakPower matched the per-inverter peaks
+        self.verified_chart_types: set[int] = set()
+        # Whether findRawdataPageList returns the newest row on a page of one,
+        # None until a full day of rows confirmed or contradicted it
+        self.rawdata_paging = None
+        # (body digest, decoded response) by endpoint and parameters
+        self._responses = {}
+        # EndpointSchedule by plantuid, or None for the account, and endpoint
+        self.endpoint_schedules = {}
+
+    async def async_login(self):
+        """Log in, unless a concurrent request already did."""
+        async with self._login_lock:
+            if self.authenticated:
+                return
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            await esolar_web_autenticate(
+                self.region, self, self.username, self.password
+            )
+            self._login_generation += 1
+            self.authenticated = True
+
+    @property
+    def login_generation(self):
+        """Return a counter that is bumped by every successful login."""
+        return self._login_generation
+
+    async def async_close(self):
+        """Close the underlying HTTP session."""
+        await self.websession.close()
+
+    def export_cookies(self):
+        """Return the portal cookies with their absolute expiry, for persisting."""
+        now = time.time()
+        cookies = []
+        for morsel in self.websession.cookie_jar:
+            expires = None
+            try:
+                if morsel["max-age"]:
+                    expires = now + int(morsel["max-age"])
+                elif morsel["expires"]:
+                    expires = parsedate_to_datetime(morsel["expires"]).timestamp()
+            except (TypeError, ValueError):
+                _LOGGER.debug("Ignoring unparsable expiry of cookie %s", morsel.key)
+            cookies.append(
+                {
+                    "name": morsel.key,
+                    "value": morsel.value,
+                    "domain": morsel["domain"],
+                    "path": morsel["path"],
+                    "expires": expires,
+                }
+            )
+        return cookies
+
+    def restore_cookies(self, cookies):
+        """Restore persisted portal cookies and treat the session as logged in."""
+        now = time.time()
+        restored = SimpleCookie()
+        for cookie in cookies:
+            if cookie["expires"] is not None and cookie["expires"] <= now:
+                continue
+            restored[cookie["name"]] = cookie["value"]
+            morsel = restored[cookie["name"]]
+            morsel["domain"] = cookie["domain"]
+            morsel["path"] = cookie["path"]
+            if cookie["expires"] is not None:
+                morsel["max-age"] = str(int(cookie["expires"] - now))
+
+        if not restored:
+            return False
+
+        self.websession.cookie_jar.update_cookies(
+            restored, URL(base_url_web(self.region))
+        )
+        self.authenticated = True
+        return True
+
+    async def post(self, url, decoder=None, **kwargs):
+        """POST to the WEB Portal and decode the JSON response.
+
+        A decoder turns the JSON into the records that are kept. Its result is
+        remembered per endpoint and parameters, and returned again without any
+        parsing while the portal answers with the same body. Callers must not
+        modify such a result.
+        """
+        key = None if decoder is None else response_key(url, kwargs.get("data"))
+        for attempt in range(2):
+            # The retry after a new login is a request of its own
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            async with self._semaphore:
+                if not self.authenticated:
+                    await self.async_login()
+                generation = self._login_generation
+                async with self.websession.post(
+                    url, timeout=aiohttp.ClientTimeout(total=WEB_TIMEOUT), **kwargs
+                ) as response:
+                    if not is_login_response(response):
+                        response.raise_for_status()
+                        digest = None
+                        if key is not None:
+                            digest = hashlib.blake2b(
+                                await response.read(), digest_size=16
+                            ).digest()
+                            cached = self._responses.get(key)
+                            if cached is not None and cached[0] == digest:
+                                return cached[1]
+                        body = await response.text()
+                        try:
+                            result = json.loads(body)
+                        except ValueError:
+                            if "login" not in body.lower():
+                                raise
+                        else:
+                            if key is not None:
+                                result = decoder(result)
+                                self._remember_response(key, digest, result)
+                            return result
+
+                _LOGGER.debug("Portal session expired, logging in again")
+                # A late answer from before a concurrent re-login must not
+                # invalidate the fresh session
+                if generation == self._login_generation:
+                    self.authenticated = False
+
+        raise ValueError("Invalid authentication credentials")
+
+    def _remember_response(self, key, digest, result):
+        """Keep a decoded response, dropping the least recently stored ones."""
+        self._responses.pop(key, None)
+        self._responses[key] = (digest, result)
+        if len(self._responses) > RESPONSE_CACHE_SIZE:
+            del self._responses[next(iter(self._responses))]
+
+
+def is_login_response(response):
+    """SAJ eSolar Helper Function - True if the portal sent us to the login page."""
+    return response.status == 401 or response.url.path.rstrip("/").endswith(
+        "/login"
+    )
+
+
+async def get_esolar_data(
+    region, session, plant_list=None, use_pv_grid_attributes=True
+):
     """SAJ eSolar Data Update."""
     if BASIC_TEST:
         return get_esolar_data_static_h1_r5(
-            region, username, password, plant_list, use_pv_grid_attributes
+            region,
+            session.username,
+            session.password,
+            plant_list,
+            use_pv_grid_attributes,
         )
 
-    try:
-        plant_info = None
-        session = esolar_web_autenticate(region, username, password)
-        plant_info = web_get_plant(region, session, plant_list)
-        web_get_plant_details(region, session, plant_info)
-        web_get_plant_detailed_chart(region, session, plant_info)
-        web_get_device_page_list(region, session, plant_info, use_pv_grid_attributes)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-    except ValueError as errv:
-        raise ValueError(errv) from errv
+    plant_info = await web_get_plant(region, session, plant_list)
+
+    # Each plant runs its own details -> (chart, devices) pipeline, so a plant
+    # never waits for a stage to finish on all the other plants.
+    await gather_or_cancel(
+        *(
+            web_get_plant_pipeline(region, session, plant, use_pv_grid_attributes)
+            for plant in plant_info["plantList"]
+        )
+    )
 
     return plant_info
 
 
-def esolar_web_autenticate(region, username, password):
-    """Authenticate the user to the SAJ's WEB Portal."""
+async def web_get_plant_pipeline(region, session, plant, use_pv_grid_attributes):
+    """Retrieve details, chart and devices for one plant as soon as possible."""
+    await web_get_plant_detail(region, session, plant)
+    await gather_or_cancel(
+        web_get_plant_chart(region, session, plant),
+        web_get_plant_devices(region, session, plant, use_pv_grid_attributes),
+    )
+
+
+async def get_esolar_metadata(
+    region,
+    session,
+    plant_list=None,
+    plant_list_only=False,
+    account_device_list=False,
+):
+    """SAJ eSolar Metadata Update - plants, their snList and their devices."""
     if BASIC_TEST:
-        return True
+        return get_esolar_data_static_h1_r5(
+            region, session.username, session.password, plant_list, False
+        )
 
-    try:
-        session = requests.Session()
-        response = session.post(
-            base_url_web(region) + "/login",
-            data={
-                "lang": "en",
-                "username": username,
-                "password": password,
-                "rememberMe": "true",
-            },
-            timeout=WEB_TIMEOUT,
+    plant_info = await web_get_plant(region, session, plant_list)
+    if plant_list_only:
+        return plant_info
+
+    if account_device_list:
+        # One paged device list for the account instead of one per plant
+        *_, device_list = await gather_or_cancel(
+            *(
+                web_get_plant_detail(region, session, plant)
+                for plant in plant_info["plantList"]
+            ),
+            web_get_account_device_list(region, session),
         )
+        for plant, kit in split_device_list(plant_info["plantList"], device_list):
+            plant.update({"kitList": kit})
+        return plant_info
 
-        response.raise_for_status()
+    await gather_or_cancel(
+        *(
+            web_get_plant_metadata(region, session, plant)
+            for plant in plant_info["plantList"]
+        )
+    )
+
+    return plant_info
+
+
+async def web_get_plant_metadata(region, session, plant):
+    """Retrieve the details and the bare kitList of one plant."""
+    await web_get_plant_detail(region, session, plant)
+    plant.update({"kitList": await web_get_plant_device_list(region, session, plant)})
+
+
+async def get_esolar_live_data(
+    region,
+    session,
+    metadata,
+    use_pv_grid_attributes=True,
+    use_inverter_sensors=True,
+    plant_list_only=False,
+    account_device_list=False,
+    previous=None,
+    endpoint_intervals=(0, 0),
+):
+    """SAJ eSolar Live Update on top of the plants of a metadata update.
+
+    Plants that are no longer in the portal's plant list are left out, so the
+    caller can tell that the metadata is stale. With plant_list_only the
+    update is the single getUserPlantList call. The previous update, if any,
+    provides the details of devices that stayed offline, and the values of
+    the endpoints that are not due. endpoint_intervals bounds, in seconds,
+    the intervals of the endpoints in ADAPTIVE_ENDPOINTS.
+    """
+    if BASIC_TEST:
+        return get_esolar_data_static_h1_r5(
+            region,
+            session.username,
+            session.password,
+            [plant["plantname"] for plant in metadata["plantList"]],
+            use_pv_grid_attributes,
+        )
+
+    # A single call brings nowPower, todayElectricity, totalElectricity and
+    # the running state of every plant
+    plant_list = await web_get_plant(region, session)
+    listed_plants = {plant["plantuid"]: plant for plant in plant_list["plantList"]}
+
+    plant_info = {"status": plant_list.get("status"), "plantList": []}
+    if plant_info["status"] != "success":
+        return plant_info
+    for known_plant in metadata["plantList"]:
+        if known_plant["plantuid"] not in listed_plants:
+            continue
+        # Copy what the live calls update, the metadata stays untouched
+        plant = dict(known_plant)
+        plant["kitList"] = [dict(kit) for kit in known_plant.get("kitList") or []]
+        plant.update(listed_plants[known_plant["plantuid"]])
+        plant_info["plantList"].append(plant)
+
+    if plant_list_only:
+        return plant_info
+
+    device_plants = [
+        plant
+        for plant in plant_info["plantList"]
+        if use_inverter_sensors or plant["type"] == 3
+    ]
+    previous_kits = index_kits(previous)
+    previous_plants = {
+        plant["plantuid"]: plant for plant in (previous or {}).get("plantList", [])
+    }
+    now = time.monotonic()
+
+    def due(plants, endpoint, schedule_key):
+        """Return whether an endpoint is due, else take its previous values."""
+        schedule = session.endpoint_schedules.setdefault(
+            (schedule_key, endpoint), EndpointSchedule()
+        )
+        previous_values = []
+        for plant in plants:
+            previous_plant = previous_plants.get(plant["plantuid"], {})
+            # Every endpoint covers the inverters of the snList
+            if sn_list(previous_plant) != sn_list(plant):
+                return True
+            # The plant started or stopped producing
+            if any(
+                previous_plant.get(key) != plant.get(key)
+                for key in PLANT_ACTIVITY_FIELDS
+            ):
+                return True
+            values = {
+                key: previous_plant[key]
+                for key in ADAPTIVE_ENDPOINTS[endpoint]
+                if key in previous_plant
+            }
+            if not values:
+                return True
+            previous_values.append(values)
+        if schedule.due(now):
+            return True
+        _LOGGER.debug("Keeping %s of %s", endpoint, schedule_key or "the account")
+        for plant, values in zip(plants, previous_values):
+            plant.update(values)
+        return False
+
+    def fetched(plants, endpoint, schedule_key):
+        """Adapt the interval of an endpoint to whether its values changed."""
+        changed = any(
+            plant.get(key) != previous_plants.get(plant["plantuid"], {}).get(key)
+            for plant in plants
+            for key in ADAPTIVE_ENDPOINTS[endpoint]
+        )
+        session.endpoint_schedules[(schedule_key, endpoint)].fetched(
+            now, changed, *endpoint_intervals
+        )
+
+    fetches = []
+    calls = []
+    for plant in plant_info["plantList"]:
+        endpoints = {
+            endpoint
+            for endpoint in ADAPTIVE_ENDPOINTS
+            if (endpoint != "detail" or plant["type"] == 3)
+            and (
+                endpoint != "devices"
+                or (
+                    (use_inverter_sensors or plant["type"] == 3)
+                    and not account_device_list
+                )
+            )
+            and due([plant], endpoint, plant["plantuid"])
+        }
+        fetches.extend(([plant], endpoint, plant["plantuid"]) for endpoint in endpoints)
+        calls.append(
+            web_get_plant_live(
+                region,
+                session,
+                plant,
+                use_pv_grid_attributes,
+                use_inverter_sensors,
+                not account_device_list,
+                previous_kits,
+                endpoints,
+            )
+        )
+    if account_device_list and device_plants and due(device_plants, "devices", None):
+        fetches.append((device_plants, "devices", None))
+        calls.append(
+            web_get_account_devices(
+                region,
+                session,
+                device_plants,
+                use_pv_grid_attributes and use_inverter_sensors,
+                previous_kits,
+            )
+        )
+    await gather_or_cancel(*calls)
+
+    for fetch in fetches:
+        fetched(*fetch)
+    return plant_info
+
+
+async def web_get_plant_live(
+    region,
+    session,
+    plant,
+    use_pv_grid_attributes,
+    use_inverter_sensors,
+    fetch_devices=True,
+    previous_kits=None,
+    endpoints=ADAPTIVE_ENDPOINTS.keys(),
+):
+    """Retrieve the values of one plant that change between polls."""
+    calls = []
+    if "chart" in endpoints:
+        calls.append(web_get_plant_chart(region, session, plant))
+    if plant["type"] == 3 and "detail" in endpoints:
+        # Battery systems keep their buy and sell counters in the details
+        calls.append(web_get_plant_detail(region, session, plant))
+    if (
+        fetch_devices
+        and "devices" in endpoints
+        and (use_inverter_sensors or plant["type"] == 3)
+    ):
+        calls.append(
+            web_get_plant_devices(
+                region,
+                session,
+                plant,
+                use_pv_grid_attributes and use_inverter_sensors,
+                previous_kits,
+            )
+        )
 
-        if response.status_code != 200:
-            raise ValueError(f"Login failed, returned {response.status_code}")
+    await gather_or_cancel(*calls)
 
-        return session
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+async def esolar_web_autenticate(region, session, username, password):
+    """Authenticate the user to the SAJ's WEB Portal."""
+    if BASIC_TEST:
+        return True
+
+    async with session.websession.post(
+        base_url_web(region) + "/login",
+        data={
+            "lang": "en",
+            "username": username,
+            "password": password,
+            "rememberMe": "true",
+        },
+        timeout=aiohttp.ClientTimeout(total=WEB_TIMEOUT),
+    ) as response:
+        response.raise_for_status()
 
+        if response.status != 200:
+            raise ValueError(f"Login failed, returned {response.status}")
 
-def web_get_plant(region, session, requested_plant_list=None):
+    return session
+
+
+async def web_get_plant(region, session, requested_plant_list=None):
     """Retrieve the platUid from WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
@@ -128,254 +846,455 @@ def web_get_plant(region, session, requested_plant_list=None):
     if BASIC_TEST:
         return web_get_plant_static_h1_r5()
 
-    try:
-        output_plant_list = []
-        response = session.post(
-            base_url_web(region) + "/monitor/site/getUserPlantList",
-            data={
-                "pageNo": "",
-                "pageSize": "",
-                "orderByIndex": "",
-                "officeId": "",
-                "clientDate": datetime.date.today().strftime("%Y-%m-%d"),
-                "runningState": "",
-                "selectInputType": "",
-                "plantName": "",
-                "deviceSn": "",
-                "type": "",
-                "countryCode": "",
-                "isRename": "",
-                "isTimeError": "",
-                "systemPowerLeast": "",
-                "systemPowerMost": "",
-            },
-            timeout=WEB_TIMEOUT,
-        )
+    output_plant_list = []
+    plant_list = await session.post(
+        base_url_web(region) + "/monitor/site/getUserPlantList",
+        data={
+            "pageNo": "",
+            "pageSize": "",
+            "orderByIndex": "",
+            "officeId": "",
+            "clientDate": datetime.date.today().strftime("%Y-%m-%d"),
+            "runningState": "",
+            "selectInputType": "",
+            "plantName": "",
+            "deviceSn": "",
+            "type": "",
+            "countryCode": "",
+            "isRename": "",
+            "isTimeError": "",
+            "systemPowerLeast": "",
+            "systemPowerMost": "",
+        },
+    )
 
-        response.raise_for_status()
-        plant_list = response.json()
-        if requested_plant_list is not None:
-            for plant in plant_list["plantList"]:
-                if plant["plantname"] in requested_plant_list:
-                    output_plant_list.append(plant)
-            return {"status": plant_list["status"], "plantList": output_plant_list}
-
-        return plant_list
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-
-def web_get_plant_details(region, session, plant_info):
+    for plant in plant_list["plantList"]:
+        if requested_plant_list is None or plant["plantname"] in requested_plant_list:
+            output_plant_list.append(decode(plant, PLANT_FIELDS))
+    # The pageHtml markup of the response is not kept
+    return {"status": plant_list.get("status"), "plantList": output_plant_list}
+
+
+async def web_get_plant_details(region, session, plant_info):
     """Retrieve platUid from the WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        device_list = []
-        for plant in plant_info["plantList"]:
-            response = session.post(
-                base_url_web(region) + "/monitor/site/getPlantDetailInfo",
-                data={
-                    "plantuid": plant["plantuid"],
-                    "clientDate": datetime.date.today().strftime("%Y-%m-%d"),
-                },
-                timeout=WEB_TIMEOUT,
-            )
+    await gather_or_cancel(
+        *(
+            web_get_plant_detail(region, session, plant)
+            for plant in plant_info["plantList"]
+        )
+    )
 
-            response.raise_for_status()
-            plant_detail = response.json()
-            plant.update(plant_detail)
-            for device in plant_detail["plantDetail"]["snList"]:
-                device_list.append(device)
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+async def web_get_plant_detail(region, session, plant):
+    """Retrieve the plantDetail of one plant."""
+    plant["plantDetail"] = await session.post(
+        base_url_web(region) + "/monitor/site/getPlantDetailInfo",
+        decoder=decode_plant_detail,
+        data={
+            "plantuid": plant["plantuid"],
+            "clientDate": datetime.date.today().strftime("%Y-%m-%d"),
+        },
+    )
 
 
-def web_get_plant_detailed_chart(region, session, plant_info):
+async def web_get_plant_detailed_chart(region, session, plant_info):
     """Retrieve the kitList from the WEB Portal with web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        today = datetime.date.today()
-        previous_chart_day = today - timedelta(days=1)
-        next_chart_day = today + timedelta(days=1)
-        chart_day = today.strftime("%Y-%m-%d")
-        previous_chart_month = add_months(today, -1).strftime("%Y-%m")
-        next_chart_month = add_months(today, 1).strftime("%Y-%m")
-        chart_month = today.strftime("%Y-%m")
-        previous_chart_year = add_years(today, -1).strftime("%Y")
-        next_chart_year = add_years(today, 1).strftime("%Y")
-        chart_year = today.strftime("%Y")
-        epochmilliseconds = round(
-            int(
-                (
-                    datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)
-                ).total_seconds()
-                * 1000
+    await gather_or_cancel(
+        *(
+            web_get_plant_chart(region, session, plant)
+            for plant in plant_info["plantList"]
+        )
+    )
+
+
+async def web_get_plant_chart(region, session, plant):
+    """Retrieve the peakList or beanList of one plant."""
+    today = datetime.date.today()
+    previous_chart_day = today - timedelta(days=1)
+    next_chart_day = today + timedelta(days=1)
+    chart_day = today.strftime("%Y-%m-%d")
+    previous_chart_month = add_months(today, -1).strftime("%Y-%m")
+    next_chart_month = add_months(today, 1).strftime("%Y-%m")
+    chart_month = today.strftime("%Y-%m")
+    previous_chart_year = add_years(today, -1).strftime("%Y")
+    next_chart_year = add_years(today, 1).strftime("%Y")
+    chart_year = today.strftime("%Y")
+    epochmilliseconds = epoch_milliseconds()
+    client_date = datetime.date.today().strftime("%Y-%m-%d")
+
+    async def fetch_chart(inverters, batched=False):
+        inverter = ",".join(inverters)
+        if plant["type"] == 3 and not batched:
+            # Battery system
+            url = f"{base_url_web(region)}/monitor/site/getPlantDetailChart2?plantuid={plant['plantuid']}&chartDateType=1&energyType=0&clientDate={client_date}&deviceSnArr=&chartCountType=2&previousChartDay={previous_chart_day}&nextChartDay={next_chart_day}&chartDay={chart_day}&previousChartMonth={previous_chart_month}&nextChartMonth={next_chart_month}&chartMonth={chart_month}&previousChartYear={previous_chart_year}&nextChartYear={next_chart_year}&chartYear={chart_year}&elecDevicesn={inverter}&_={epochmilliseconds}"
+        else:
+            # Normal system, or the serials of all inverters
+            url = f"{base_url_web(region)}/monitor/site/getPlantDetailChart2?plantuid={plant['plantuid']}&chartDateType=1&energyType=0&clientDate={client_date}&deviceSnArr={inverter}&chartCountType=2&previousChartDay={previous_chart_day}&nextChartDay={next_chart_day}&chartDay={chart_day}&previousChartMonth={previous_chart_month}&nextChartMonth={next_chart_month}&chartMonth={chart_month}&previousChartYear={previous_chart_year}&nextChartYear={next_chart_year}&chartYear={chart_year}&elecDevicesn=&_={epochmilliseconds}"
+
+        _LOGGER.debug("Fetching URL    : %s", url)
+        # The chart is kept split per inverter, the serials are in the URL
+        entries = await session.post(url, decoder=partial(split_plant_chart, inverters))
+        if VERBOSE_DEBUG:
+            _LOGGER.debug(
+                "\n.../getPlantDetailChart2\n------------------------\n%s",
+                entries,
+            )
+        return entries
+
+    inverters = plant["plantDetail"]["snList"]
+    entries = None
+    if len(inverters) > 1 and plant["type"] not in session.unbatched_chart_types:
+        # All serials in deviceSnArr, one request for the plant
+        try:
+            entries = await fetch_chart(inverters, True)
+        except (aiohttp.ClientResponseError, json.JSONDecodeError) as err:
+            _LOGGER.debug("Batched chart rejected: %s", err)
+        if entries is None:
+            _LOGGER.debug(
+                "Plant type %s has no batched chart, fetching per inverter",
+                plant["type"],
             )
+            session.unbatched_chart_types.add(plant["type"])
+
+    batched_entries = entries
+    if entries is None or (
+        plant["type"] == 0 and plant["type"] not in session.verified_chart_types
+    ):
+        plant_charts = await gather_or_cancel(
+            *(fetch_chart([inverter]) for inverter in inverters)
         )
-        client_date = datetime.date.today().strftime("%Y-%m-%d")
-
-        for plant in plant_info["plantList"]:
-            #
-            # NOTE : This URL now takes a sinle inverter, but it should somehow take a list
-            #
-            # deviceSnArr={plant['plantDetail']['snList'][0]  <<== Is correct if there is only one inverter in the system
-            #
-            bean = []
-            peak_pow = []
-            for inverter in plant["plantDetail"]["snList"]:
-                if plant["type"] == 3:
-                    # Battery system
-                    url = f"{base_url_web(region)}/monitor/site/getPlantDetailChart2?plantuid={plant['plantuid']}&chartDateType=1&energyType=0&clientDate={client_date}&deviceSnArr=&chartCountType=2&previousChartDay={previous_chart_day}&nextChartDay={next_chart_day}&chartDay={chart_day}&previousChartMonth={previous_chart_month}&nextChartMonth={next_chart_month}&chartMonth={chart_month}&previousChartYear={previous_chart_year}&nextChartYear={next_chart_year}&chartYear={chart_year}&elecDevicesn={inverter}&_={epochmilliseconds}"
-                else:
-                    # Normal system
-                    url = f"{base_url_web(region)}/monitor/site/getPlantDetailChart2?plantuid={plant['plantuid']}&chartDateType=1&energyType=0&clientDate={client_date}&deviceSnArr={inverter}&chartCountType=2&previousChartDay={previous_chart_day}&nextChartDay={next_chart_day}&chartDay={chart_day}&previousChartMonth={previous_chart_month}&nextChartMonth={next_chart_month}&chartMonth={chart_month}&previousChartYear={previous_chart_year}&nextChartYear={next_chart_year}&chartYear={chart_year}&elecDevicesn=&_={epochmilliseconds}"
-
-                _LOGGER.debug("Fetching URL    : %s", url)
-                response = session.post(url, timeout=WEB_TIMEOUT)
-                response.raise_for_status()
-                plant_chart = response.json()
-                if VERBOSE_DEBUG:
-                    _LOGGER.debug(
-                        "\n.../getPlantDetailChart2\n------------------------\n%s",
-                        plant_chart,
-                    )
-                if (plant_chart["type"]) == 0:
-                    tmp = {}
-                    tmp.update({"devicesn": inverter})
-                    tmp.update({"peakPower": plant_chart["peakPower"]})
-                    peak_pow.append(tmp)
-                    plant.update({"peakList": peak_pow})
-                    # plant.update({"peakPower": plant_chart["peakPower"]})
-                elif (plant_chart["type"]) == 1:
-                    plant_chart["viewBean"].update({"devicesn": inverter})
-                    bean.append(plant_chart["viewBean"])
-                    plant.update({"beanList": bean})
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-
-def web_get_device_page_list(region, session, plant_info, use_pv_grid_attributes):
+        entries = [
+            entry for plant_chart in plant_charts for entry in plant_chart or []
+        ]
+
+    if batched_entries is not None and batched_entries is not entries:
+        # A portal that only reads one serial of the batch can not be told
+        # from one that adds them up, the first batch of the type with two
+        # inverters that have a peak decides
+        batched_peak = sum(entry.get("peakPower") or 0 for _, entry in batched_entries)
+        peaks = [entry["peakPower"] for _, entry in entries if entry.get("peakPower")]
+        if len(peaks) < 2:
+            _LOGGER.debug(
+                "Batched peakPower of plant type %s not verified yet", plant["type"]
+            )
+        elif round(batched_peak, 3) == round(sum(peaks), 3):
+            session.verified_chart_types.add(plant["type"])
+        else:
+            _LOGGER.debug(
+                "Batched peakPower %s is not the sum %s of the inverters, "
+                "fetching plant type %s per inverter",
+                batched_peak,
+                sum(peaks),
+                plant["type"],
+            )
+            session.unbatched_chart_types.add(plant["type"])
+
+    peak_pow = [entry for chart_type, entry in entries if chart_type == 0]
+    bean = [entry for chart_type, entry in entries if chart_type == 1]
+    if peak_pow:
+        plant.update({"peakList": peak_pow})
+    if bean:
+        plant.update({"beanList": bean})
+
+
+def split_plant_chart(inverters, plant_chart):
+    """SAJ eSolar Helper Function - Split a chart into (type, entry) per inverter.
+
+    The peakPower of a chart over several inverters is the plant's peak, it is
+    kept as a single peakList entry. Returns None for a chart without a usable
+    type, peakPower or viewBean, and for a viewBean that can not be told apart
+    per inverter.
+    """
+    if not isinstance(plant_chart, dict):
+        return None
+    if plant_chart.get("type") == 0:
+        if "peakPower" not in plant_chart:
+            return None
+        peak = {"devicesn": ",".join(inverters), "peakPower": plant_chart["peakPower"]}
+        return [(0, decode(peak, PEAK_FIELDS))]
+    if plant_chart.get("type") != 1:
+        return None
+
+    view_bean = plant_chart.get("viewBean")
+    if isinstance(view_bean, list) and len(inverters) == 1 and len(view_bean) == 1:
+        beans = [(inverters[0], view_bean[0])]
+    elif isinstance(view_bean, list):
+        # Matched on devicesn, the order of the list is not relied upon
+        by_sn = {
+            bean.get("devicesn"): bean for bean in view_bean if isinstance(bean, dict)
+        }
+        if len(view_bean) != len(inverters) or set(by_sn) != set(inverters):
+            return None
+        beans = ((inverter, by_sn[inverter]) for inverter in inverters)
+    elif isinstance(view_bean, dict) and all(sn in view_bean for sn in inverters):
+        beans = ((inverter, view_bean[inverter]) for inverter in inverters)
+    elif isinstance(view_bean, dict) and len(inverters) == 1:
+        beans = [(inverters[0], view_bean)]
+    else:
+        return None
+    return [
+        (1, decode({**bean, "devicesn": inverter}, BEAN_FIELDS))
+        for inverter, bean in beans
+    ]
+
+
+async def web_get_device_page_list(region, session, plant_info, use_pv_grid_attributes):
     """Retrieve the platUid from the WEB Portal with web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    await gather_or_cancel(
+        *(
+            web_get_plant_devices(region, session, plant, use_pv_grid_attributes)
+            for plant in plant_info["plantList"]
+        )
+    )
+
+
+async def web_get_plant_devices(
+    region, session, plant, use_pv_grid_attributes, previous_kits=None
+):
+    """Retrieve the kitList of one plant, with the details of every device."""
+    kit = await web_get_plant_device_list(region, session, plant)
+    previous_kits = previous_kits or {}
+    await gather_or_cancel(
+        *(
+            web_get_device_details(
+                region,
+                session,
+                plant,
+                device,
+                DEVICE_HEADERS,
+                use_pv_grid_attributes,
+                previous_kits.get(device["devicesn"]),
+            )
+            for device in kit
+        )
+    )
+
+    plant.update({"kitList": kit})
+
+
+async def web_get_account_devices(
+    region, session, plants, use_pv_grid_attributes, previous_kits=None
+):
+    """Retrieve the kitList of several plants from the account's device list."""
+    device_list = await web_get_account_device_list(region, session)
+    kits = split_device_list(plants, device_list)
+    previous_kits = previous_kits or {}
+    await gather_or_cancel(
+        *(
+            web_get_device_details(
+                region,
+                session,
+                plant,
+                device,
+                DEVICE_HEADERS,
+                use_pv_grid_attributes,
+                previous_kits.get(device["devicesn"]),
+            )
+            for plant, kit in kits
+            for device in kit
+        )
+    )
+
+    for plant, kit in kits:
+        plant.update({"kitList": kit})
+
+
+async def web_get_account_device_list(region, session):
+    """Retrieve every device of the account, page by page."""
+    url = f"{base_url_web(region)}/cloudMonitor/device/findDevicePageList"
+    local_date = datetime.date.today().strftime("%Y-%m-%d")
+    chart_month = datetime.date.today().strftime("%Y-%m")
+    device_list = []
+    for page_no in range(1, MAX_DEVICE_PAGES + 1):
+        payload = f"officeId=1&pageNo={page_no}&pageSize={DEVICE_PAGE_SIZE}&orderName=1&orderType=2&plantuid=&deviceStatus=&localDate={local_date}&localMonth={chart_month}"
+        _LOGGER.debug("Fetching URL    : %s", url)
+        _LOGGER.debug("Fetching Payload: %s", payload)
+        page = await session.post(url, headers=DEVICE_HEADERS, data=payload)
+        device_list.extend(decode(device, DEVICE_FIELDS) for device in page["list"])
+        total = page.get("count")
+        if len(page["list"]) < DEVICE_PAGE_SIZE or (
+            total is not None and len(device_list) >= total
+        ):
+            break
+    else:
+        _LOGGER.warning(
+            "Device list has more than %s devices, the rest is ignored",
+            len(device_list),
+        )
+
+    if VERBOSE_DEBUG:
+        _LOGGER.debug(
+            "\n.../findDevicePageList\n----------------------\n%s", device_list
+        )
+    return device_list
+
+
+def sn_list(plant):
+    """SAJ eSolar Helper Function - Return the snList of a plant, if it has one."""
+    return plant.get("plantDetail", {}).get("snList")
+
+
+def index_kits(data):
+    """SAJ eSolar Helper Function - Index the kitLists of an update by devicesn."""
+    if data is None:
+        return {}
+    return {
+        kit["devicesn"]: kit
+        for plant in data["plantList"]
+        for kit in plant.get("kitList") or []
     }
 
-    try:
-        for plant in plant_info["plantList"]:
-            _LOGGER.debug("Plant UID: %s", plant["plantuid"])
-            _LOGGER.debug("Plant Type: %s", plant["type"])
-
-            chart_month = datetime.date.today().strftime("%Y-%m")
-            url = f"{base_url_web(region)}/cloudMonitor/device/findDevicePageList"
-            payload = f"officeId=1&pageNo=&pageSize=&orderName=1&orderType=2&plantuid={plant['plantuid']}&deviceStatus=&localDate={datetime.date.today().strftime('%Y-%m-%d')}&localMonth={chart_month}"
-            _LOGGER.debug("Fetching URL    : %s", url)
-            _LOGGER.debug("Fetching Payload: %s", payload)
-            response = session.post(
-                url, headers=headers, data=payload, timeout=WEB_TIMEOUT
+
+def split_device_list(plants, device_list):
+    """SAJ eSolar Helper Function - Split a device list into kitLists by snList."""
+    plant_by_sn = {
+        devicesn: plant
+        for plant in plants
+        for devicesn in plant["plantDetail"]["snList"]
+    }
+    kits = {plant["plantuid"]: [] for plant in plants}
+    for device in device_list:
+        if (plant := plant_by_sn.get(device["devicesn"])) is not None:
+            kits[plant["plantuid"]].append(device)
+    return [(plant, kits[plant["plantuid"]]) for plant in plants]
+
+
+async def web_get_plant_device_list(region, session, plant):
+    """Retrieve the devices of one plant that are in its snList."""
+    _LOGGER.debug("Plant UID: %s", plant["plantuid"])
+    _LOGGER.debug("Plant Type: %s", plant["type"])
+
+    chart_month = datetime.date.today().strftime("%Y-%m")
+    url = f"{base_url_web(region)}/cloudMonitor/device/findDevicePageList"
+    payload = f"officeId=1&pageNo=&pageSize=&orderName=1&orderType=2&plantuid={plant['plantuid']}&deviceStatus=&localDate={datetime.date.today().strftime('%Y-%m-%d')}&localMonth={chart_month}"
+    _LOGGER.debug("Fetching URL    : %s", url)
+    _LOGGER.debug("Fetching Payload: %s", payload)
+    device_list = (
+        await session.post(url, headers=DEVICE_HEADERS, data=payload)
+    )["list"]
+    if VERBOSE_DEBUG:
+        _LOGGER.debug(
+            "\n.../findDevicePageList\n----------------------\n%s", device_list
+        )
+
+    return [
+        decode(device, DEVICE_FIELDS)
+        for device in device_list
+        if device["devicesn"] in plant["plantDetail"]["snList"]
+    ]
+
+
+async def web_get_device_details(
+    region, session, plant, device, headers, use_pv_grid_attributes, previous=None
+):
+    """Retrieve the raw data and storage information of one device.
+
+    A device that is offline, and was offline with the same status in the
+    previous update, keeps the details of that update. They are not used
+    while the device is offline, so they are not fetched again.
+    """
+    _LOGGER.debug("Device SN: %s", device["devicesn"])
+    details = []
+    if use_pv_grid_attributes:
+        details.append("findRawdataPageList")
+    if plant["type"] == 3:
+        details.append("storeDevicePower")
+    if (
+        device["onLineStr"] != "1"
+        and previous is not None
+        and previous["onLineStr"] == device["onLineStr"]
+        and all(key in previous for key in details)
+    ):
+        _LOGGER.debug("Device %s is still offline", device["devicesn"])
+        device.update({key: previous[key] for key in details})
+        return
+
+    calls = []
+    if use_pv_grid_attributes:
+        calls.append(web_get_device_rawdata(region, session, device, headers))
+
+    # Fetch battery for H1 system (UNTESTED CODE)
+    if plant["type"] == 3:
+        calls.append(
+            web_get_device_store_power(region, session, plant, device, headers)
+        )
+
+    await gather_or_cancel(*calls)
+
+
+async def web_get_device_rawdata(region, session, device, headers):
+    """Retrieve the newest findRawdataPageList row of one device.
+
+    The first page of one row, ordered by timeStart, is compared once with
+    the newest row of the whole day. If the portal ignores the paging or the
+    order, the whole day is requested from then on.
+    """
+    url = f"{base_url_web(region)}/cloudMonitor/deviceInfo/findRawdataPageList"
+    payload = f"deviceSn={device['devicesn']}&deviceType={device['type']}&timeStr={datetime.date.today().strftime('%Y-%m-%d')}"
+    paged = session.rawdata_paging is not False
+    rows, newest = 0, None
+    if paged:
+        # Ask for the newest row only, not the whole day
+        paged_payload = f"{payload}&pageNo=1&pageSize=1&orderName=timeStart&orderType=2"
+        _LOGGER.debug("Fetching URL    : %s", url)
+        _LOGGER.debug("Fetching Payload: %s", paged_payload)
+        rows, newest = await session.post(
+            url, decoder=decode_rawdata, headers=headers, data=paged_payload
+        )
+        _LOGGER.debug("Result length   : %s", rows)
+        if rows > 1:
+            _LOGGER.warning(
+                "findRawdataPageList ignores paging, the newest of %s rows is used",
+                rows,
             )
-            response.raise_for_status()
-            device_list = response.json()["list"]
-            if VERBOSE_DEBUG:
-                _LOGGER.debug(
-                    "\n.../findDevicePageList\n----------------------\n%s", device_list
+            session.rawdata_paging = False
+
+    if not paged or (rows == 1 and session.rawdata_paging is None):
+        paged_newest = newest
+        _LOGGER.debug("Fetching URL    : %s", url)
+        _LOGGER.debug("Fetching Payload: %s", payload)
+        rows, newest = await session.post(
+            url, decoder=decode_rawdata, headers=headers, data=payload
+        )
+        _LOGGER.debug("Result length   : %s", rows)
+        if paged and session.rawdata_paging is None:
+            session.rawdata_paging = paged_newest == newest
+            if not session.rawdata_paging:
+                _LOGGER.warning(
+                    "findRawdataPageList does not return the newest row first, "
+                    "the whole day of rows is requested instead"
                 )
+    device.update({"findRawdataPageList": newest})
 
-            kit = []
-            for device in device_list:
-                if not device["devicesn"] in plant["plantDetail"]["snList"]:
-                    continue
-                _LOGGER.debug("Device SN: %s", device["devicesn"])
-                if use_pv_grid_attributes:
-                    url = f"{base_url_web(region)}/cloudMonitor/deviceInfo/findRawdataPageList"
-                    payload = f"deviceSn={device['devicesn']}&deviceType={device['type']}&timeStr={datetime.date.today().strftime('%Y-%m-%d')}"
-                    _LOGGER.debug("Fetching URL    : %s", url)
-                    _LOGGER.debug("Fetching Payload: %s", payload)
-                    response = session.post(
-                        url, headers=headers, data=payload, timeout=WEB_TIMEOUT
-                    )
-                    response.raise_for_status()
-                    find_rawdata_page_list = response.json()
-                    _LOGGER.debug(
-                        "Result length   : %s", len(find_rawdata_page_list["list"])
-                    )
-
-                    if len(find_rawdata_page_list["list"]) > 0:
-                        device.update(
-                            {"findRawdataPageList": find_rawdata_page_list["list"][0]}
-                        )
-                    else:
-                        device.update({"findRawdataPageList": None})
-
-                    if VERBOSE_DEBUG and len(find_rawdata_page_list["list"]) > 0:
-                        _LOGGER.debug(
-                            "\n.../findRawdataPageList\n-----------------------\n%s",
-                            find_rawdata_page_list["list"][0],
-                        )
-
-                # Fetch battery for H1 system (UNTESTED CODE)
-                if plant["type"] == 3:
-                    _LOGGER.debug("Fetching storage information")
-                    epochmilliseconds = round(
-                        int(
-                            (
-                                datetime.datetime.utcnow()
-                                - datetime.datetime(1970, 1, 1)
-                            ).total_seconds()
-                            * 1000
-                        )
-                    )
-                    url = f"{base_url_web(region)}/monitor/site/getStoreOrAcDevicePowerInfo"
-                    payload = f"plantuid={plant['plantuid']}&devicesn={device['devicesn']}&_={epochmilliseconds}"
-                    _LOGGER.debug("Fetching URL    : %s", url)
-                    _LOGGER.debug("Fetching Payload: %s", payload)
-                    response = session.post(
-                        url, headers=headers, data=payload, timeout=WEB_TIMEOUT
-                    )
-                    response.raise_for_status()
-                    store_device_power = response.json()
-                    device.update(store_device_power)
-                    if VERBOSE_DEBUG:
-                        _LOGGER.debug(
-                            "getStoreOrAcDevicePowerInfo\n-------------------------------\n%s",
-                            store_device_power,
-                        )
-
-                kit.append(device)
+    if VERBOSE_DEBUG and newest is not None:
+        _LOGGER.debug(
+            "\n.../findRawdataPageList\n-----------------------\n%s", newest
+        )
 
-            plant.update({"kitList": kit})
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+async def web_get_device_store_power(region, session, plant, device, headers):
+    """Retrieve the storeDevicePower of one device."""
+    _LOGGER.debug("Fetching storage information")
+    epochmilliseconds = epoch_milliseconds()
+    url = f"{base_url_web(region)}/monitor/site/getStoreOrAcDevicePowerInfo"
+    payload = f"plantuid={plant['plantuid']}&devicesn={device['devicesn']}&_={epochmilliseconds}"
+    _LOGGER.debug("Fetching URL    : %s", url)
+    _LOGGER.debug("Fetching Payload: %s", payload)
+    store_device_power = await session.post(
+        url, decoder=decode_store_device_power, headers=headers, data=payload
+    )
+    device["storeDevicePower"] = store_device_power
+    if VERBOSE_DEBUG:
+        _LOGGER.debug(
+            "getStoreOrAcDevicePowerInfo\n-------------------------------\n%s",
+            store_device_power,
+        )
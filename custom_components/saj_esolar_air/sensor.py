@@ -1,23 +1,44 @@
 """Support for ESolar sensors."""
 from __future__ import annotations
 
-import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
+from functools import partial
 import logging
+import time
+from typing import Any, NamedTuple
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfApparentPower,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfFrequency,
+    UnitOfPower,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import ESolarCoordinator, ESolarResponse
+from . import (
+    ESolarBeanList,
+    ESolarCoordinator,
+    ESolarKitList,
+    ESolarPlantAggregates,
+    ESolarPlantList,
+    ESolarResponse,
+)
 from .const import (
     B_B_LOAD,
     B_BACKUP_POWER_W,
@@ -51,6 +72,7 @@ from .const import (
     B_USELEC,
     CONF_INVERTER_SENSORS,
     CONF_MONITORED_SITES,
+    CONF_PLANT_LIST_ONLY,
     CONF_PV_GRID_DATA,
     DOMAIN,
     G_POWER,
@@ -61,7 +83,6 @@ from .const import (
     I_G_CURR_L,
     I_G_FREQ_L,
     I_G_VOL_L,
-    I_HISTORY,
     I_MOD_SN,
     I_MODEL,
     I_MONTH_E,
@@ -113,6 +134,764 @@ PARALLEL_UPDATES = 0
 
 _LOGGER = logging.getLogger(__name__)
 
+# Portal codes to the strings shown in Home Assistant
+PLANT_RUNNING_STATE = {1: "Normal", 2: "Alarm", 3: "Offline"}
+PLANT_TYPE = {
+    0: P_TYPE_GRID,
+    1: P_TYPE_STORAGE,
+    2: P_TYPE_BLEND,
+    3: P_TYPE_AC_COUPLING,
+}
+INVERTER_TYPE = {0: P_TYPE_ONGRID, 1: P_TYPE_STORAGE, 2: P_TYPE_AC_COUPLING}
+INVERTER_STATUS = {"1": I_NORMAL, "2": I_ALARM, "3": I_OFFLINE, "4": I_STOCK}
+BATTERY_DIRECTION = {0: B_DIR_STB, 1: B_DIR_DIS, -1: B_DIR_CH}
+FLOW_DIRECTION = {1: B_EXPORT, -1: B_IMPORT}
+
+# Attributes kept out of the recorder. The static ones never change, and the
+# high-churn ones would make every recorded attribute set unique, so none of
+# them could be shared between rows.
+STATIC_ATTRIBUTES = frozenset(
+    {
+        P_NAME,
+        P_UID,
+        P_ADR,
+        P_TYPE,
+        P_POWER,
+        P_CURRENCY,
+        I_MODEL,
+        I_TYPE,
+        I_SN,
+        I_PC,
+        I_DB,
+        I_CTR,
+        I_MOD_SN,
+        B_CAPACITY,
+    }
+)
+HIGH_CHURN_ATTRIBUTES = frozenset(
+    {
+        P_CURRENT_POWER,
+        I_TOTAL_E,
+        I_CURRENT_POWER,
+        I_PV_VOL_PV,
+        I_PV_CURR_PV,
+        I_G_VOL_L,
+        I_G_CURR_L,
+        I_G_FREQ_L,
+        B_GRID_POWER_W,
+        B_GRID_POWER_VA,
+        B_OUT_VOLT,
+        B_OUT_CURR,
+        B_OUT_POWER_WATT,
+        B_OUT_POWER_VA,
+        B_OUT_FREQ,
+        B_ON_G_VOLT,
+        B_ON_G_FREQ,
+        B_ON_G_POWER_W,
+        B_BACKUP_POWER_W,
+        B_CURRENT,
+        B_POWER,
+        G_POWER,
+        IO_POWER,
+        PV_POWER,
+        B_T_LOAD,
+        B_H_LOAD,
+        B_B_LOAD,
+        S_POWER,
+    }
+)
+
+
+class ESolarSource(NamedTuple):
+    """The records one sensor reads, resolved once per refresh."""
+
+    plant: ESolarPlantList
+    aggregates: ESolarPlantAggregates
+    kit: ESolarKitList | None
+    bean: ESolarBeanList | None
+
+
+@dataclass
+class ESolarRequiredKeysMixin:
+    """Mixin for required keys."""
+
+    unique_id_format: str
+    name_format: str
+    value_fn: Callable[[ESolarSource], StateType]
+
+
+@dataclass
+class ESolarSensorEntityDescription(SensorEntityDescription, ESolarRequiredKeysMixin):
+    """Describes an eSolar sensor.
+
+    Plant sensors format their unique ID and name with the plant UID and name,
+    inverter sensors with the inverter serial.
+    """
+
+    attributes: tuple[str, ...] = ()
+    attrs_fn: Callable[[ESolarSource], dict[str, Any]] | None = None
+    pv_grid_attributes: tuple[str, ...] = ()
+    pv_grid_attrs_fn: Callable[[ESolarSource], dict[str, Any]] | None = None
+    plant_types: tuple[int, ...] | None = None
+    plant_list_only: bool = False
+    requires_pv_grid_data: bool = False
+    # Changes within the larger of the absolute deadband, in the native unit,
+    # and the relative deadband, as a fraction of the written value, are not
+    # written until the heartbeat interval of the options has passed.
+    deadband: float = 0
+    deadband_relative: float = 0
+
+
+def _plant_status_attrs(source: ESolarSource) -> dict[str, Any]:
+    """Return the attributes of the plant status sensor."""
+    plant = source.plant
+    attrs = {
+        P_ADR: plant["address"] + " " + plant["country"],
+        P_TYPE: PLANT_TYPE.get(plant["type"]),
+        P_POWER: plant["systempower"],
+        P_CURRENCY: plant["currency"],
+        P_TOTAL_E: plant["totalElectricity"],
+    }
+    if "plantDetail" not in plant:
+        # Plant list only mode has no details
+        attrs.update({P_INCOME: None, P_CO2: None, P_TREES: None})
+        return attrs
+    detail = plant["plantDetail"]
+    attrs[P_INCOME] = detail["income"] if detail["type"] == 0 else None
+    attrs[P_CO2] = detail["totalReduceCo2"]
+    attrs[P_TREES] = detail["totalPlantTreeNum"]
+    return attrs
+
+
+def _inverter_energy_attrs(source: ESolarSource) -> dict[str, Any]:
+    """Return the attributes of the inverter energy sensor."""
+    attrs: dict[str, Any] = {}
+    if (kit := source.kit) is not None:
+        attrs.update(
+            {
+                I_MODEL: kit["devicetype"],
+                I_TYPE: INVERTER_TYPE.get(kit["type"], P_UNKNOWN),
+                I_SN: kit["devicesn"],
+                I_PC: kit["devicepc"],
+                I_DB: kit["displayfw"],
+                I_CTR: kit["mastermcufw"],
+                I_MOD_SN: kit["kitSn"],
+                I_TODAY_E: kit["todaySellEnergy"],
+                I_MONTH_E: kit["monthSellEnergy"],
+                I_TOTAL_E: kit["totalSellEnergy"],
+                I_STATUS: INVERTER_STATUS.get(kit["onLineStr"], P_UNKNOWN),
+                I_CURRENT_POWER: kit["powernow"],
+            }
+        )
+        if kit["type"] == 2:
+            attrs[B_DIRECTION] = BATTERY_DIRECTION.get(
+                kit["storeDevicePower"]["batteryDirection"], P_UNKNOWN
+            )
+    if (bean := source.bean) is not None:
+        attrs.update(
+            {
+                B_PVELEC: bean["pvElec"],
+                B_USELEC: bean["useElec"],
+                B_BUYELEC: bean["buyElec"],
+                B_SELLELEC: bean["sellElec"],
+                B_BUY_RATE: bean["buyRate"],
+                B_SELL_RATE: bean["sellRate"],
+            }
+        )
+    return attrs
+
+
+def _inverter_attrs(source: ESolarSource) -> dict[str, Any]:
+    """Return the model and serial attributes of an inverter sensor."""
+    if (kit := source.kit) is None:
+        return {}
+    return {I_MODEL: kit["devicetype"], I_SN: kit["devicesn"]}
+
+
+def _phases(raw: dict[str, Any], key: str) -> list[Any]:
+    """Return the R, S and T phase values of a findRawdataPageList key."""
+    return [raw[f"r{key}"], raw[f"s{key}"], raw[f"t{key}"]]
+
+
+def _inverter_pv_grid_attrs(source: ESolarSource) -> dict[str, Any]:
+    """Return the photovoltaics and grid attributes of the inverter power sensor."""
+    if (kit := source.kit) is None:
+        return {}
+    if kit["onLineStr"] != "1":
+        return {
+            I_PV_VOL_PV: [None, None, None],
+            I_PV_CURR_PV: [None, None, None],
+            I_G_VOL_L: [None, None, None],
+            I_G_CURR_L: [None, None, None],
+            I_G_FREQ_L: [None, None, None],
+        }
+
+    raw: dict[str, Any] = kit["findRawdataPageList"]
+    attrs = {
+        I_PV_VOL_PV: [raw["pV1Volt"], raw["pV2Volt"], raw["pV3Volt"]],
+        I_PV_CURR_PV: [raw["pV1Curr"], raw["pV2Curr"], raw["pV3Curr"]],
+        I_G_VOL_L: _phases(raw, "GridVolt"),
+        I_G_CURR_L: _phases(raw, "GridCurr"),
+        I_G_FREQ_L: _phases(raw, "GridFreq"),
+    }
+    if raw["deviceType"] == 2:
+        attrs.update(
+            {
+                B_GRID_POWER_W: _phases(raw, "GridPowerWatt"),
+                B_GRID_POWER_VA: _phases(raw, "GridPowerVA"),
+                B_OUT_VOLT: _phases(raw, "OutVolt"),
+                B_OUT_CURR: _phases(raw, "OutCurr"),
+                B_OUT_POWER_WATT: _phases(raw, "OutPowerWatt"),
+                B_OUT_POWER_VA: _phases(raw, "OutPowerVA"),
+                B_OUT_FREQ: _phases(raw, "OutFreq"),
+                B_ON_G_VOLT: _phases(raw, "OnGridOutVolt"),
+                B_ON_G_FREQ: [raw["rOnGridOutFreq"]],
+                B_ON_G_POWER_W: _phases(raw, "OnGridOutPowerWatt"),
+                B_BACKUP_POWER_W: [raw["rBackupPowerWatt"]],
+            }
+        )
+    return attrs
+
+
+def _inverter_battery_soc(source: ESolarSource) -> float | None:
+    """Return the state of charge of an online inverter battery."""
+    if source.kit is None or source.kit["onLineStr"] != "1":
+        return None
+    return source.kit["storeDevicePower"]["batEnergyPercent"]
+
+
+def _inverter_battery_attrs(source: ESolarSource) -> dict[str, Any]:
+    """Return the attributes of the inverter battery sensor."""
+    if (kit := source.kit) is None:
+        return {}
+    power = kit["storeDevicePower"]
+    attrs = {
+        I_MODEL: kit["devicetype"],
+        I_SN: kit["devicesn"],
+        B_CAPACITY: power["batCapcityStr"],
+    }
+    if kit["onLineStr"] != "1":
+        return attrs
+    attrs.update(
+        {
+            B_CURRENT: power["batCurr"],
+            B_POWER: power["batteryPower"],
+            B_DIRECTION: BATTERY_DIRECTION.get(power["batteryDirection"], P_UNKNOWN),
+            G_POWER: power["gridPower"],
+            B_GRID_DIRECT: FLOW_DIRECTION.get(power["gridDirection"], P_UNKNOWN),
+            IO_POWER: power["inputOutputPower"],
+            IO_DIRECTION: FLOW_DIRECTION.get(power["outPutDirection"], P_UNKNOWN),
+            PV_POWER: power["pvPower"],
+            PV_DIRECTION: FLOW_DIRECTION.get(power["pvDirection"], P_UNKNOWN),
+            B_T_LOAD: power["totalLoadPower"],
+            B_H_LOAD: power["homeLoadPower"],
+            B_B_LOAD: power["backupLoadPower"],
+            S_POWER: power["solarPower"],
+        }
+    )
+    return attrs
+
+
+def _rawdata_value(key: str, source: ESolarSource) -> StateType:
+    """Return one findRawdataPageList value of an online inverter."""
+    if (kit := source.kit) is None or kit["onLineStr"] != "1":
+        return None
+    if (raw := kit["findRawdataPageList"]) is None:
+        return None
+    return raw.get(key)
+
+
+def _store_power_value(key: str, source: ESolarSource) -> StateType:
+    """Return one storeDevicePower value of an online inverter."""
+    if (kit := source.kit) is None or kit["onLineStr"] != "1":
+        return None
+    return kit["storeDevicePower"].get(key)
+
+
+PLANT_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="status",
+        unique_id_format="plantUid_{}",
+        name_format="Plant {} Status",
+        icon=ICON_PANEL,
+        value_fn=lambda source: PLANT_RUNNING_STATE.get(source.plant["runningState"]),
+        attributes=(
+            P_ADR,
+            P_TYPE,
+            P_POWER,
+            P_CURRENCY,
+            P_TOTAL_E,
+            P_CO2,
+            P_TREES,
+        ),
+        attrs_fn=_plant_status_attrs,
+        plant_list_only=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_total",
+        unique_id_format="plantUid_energy_{}",
+        name_format="Plant {} Energy Total ",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.plant["totalElectricity"],
+        attributes=(P_TODAY_E, P_CURRENT_POWER, P_PEAK_POWER),
+        attrs_fn=lambda source: {
+            P_TODAY_E: source.plant["todayElectricity"],
+            P_CURRENT_POWER: source.plant["nowPower"],
+            P_PEAK_POWER: source.aggregates["peakPower"],
+        },
+        plant_types=(0,),
+        plant_list_only=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_sell",
+        unique_id_format="plantUid_energy_sell_{}",
+        name_format="Plant {} Sell Energy Total",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.plant["plantDetail"]["totalSellElec"],
+        plant_types=(3,),
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_buy",
+        unique_id_format="plantUid_energy_buy_{}",
+        name_format="Plant {} Buy Energy Total",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.plant["plantDetail"]["totalBuyElec"],
+        plant_types=(3,),
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_charge",
+        unique_id_format="plantUid_energy_charge_{}",
+        name_format="Plant {} Charge Energy",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.aggregates["chargeElec"],
+        plant_types=(3,),
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_discharge",
+        unique_id_format="plantUid_energy_discharge_{}",
+        name_format="Plant {} Discharge Energy",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: source.aggregates["dischargeElec"],
+        plant_types=(3,),
+    ),
+    ESolarSensorEntityDescription(
+        key="battery_soc",
+        unique_id_format="plantUid_energy_battery_soc_{}",
+        name_format="Plant {} State Of Charge",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: source.aggregates["batEnergyPercent"],
+        plant_types=(3,),
+        deadband=1,
+    ),
+)
+
+INVERTER_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="inverter_energy_total",
+        unique_id_format="inverter_{}",
+        name_format="Inverter {} Energy Total",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda source: (
+            None if source.kit is None else source.kit["totalSellEnergy"]
+        ),
+        attributes=(
+            I_MODEL,
+            I_TYPE,
+            I_SN,
+            I_PC,
+            I_DB,
+            I_CTR,
+            I_MOD_SN,
+            I_TODAY_E,
+            I_MONTH_E,
+            I_TOTAL_E,
+            I_STATUS,
+            I_CURRENT_POWER,
+        ),
+        attrs_fn=_inverter_energy_attrs,
+    ),
+    ESolarSensorEntityDescription(
+        key="inverter_power",
+        unique_id_format="PV_{}",
+        name_format="Inverter {} Power",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda source: (
+            None if source.kit is None else source.kit["powernow"]
+        ),
+        attributes=(I_MODEL, I_SN),
+        attrs_fn=_inverter_attrs,
+        pv_grid_attributes=(
+            I_PV_VOL_PV,
+            I_PV_CURR_PV,
+            I_G_VOL_L,
+            I_G_CURR_L,
+            I_G_FREQ_L,
+        ),
+        pv_grid_attrs_fn=_inverter_pv_grid_attrs,
+        deadband=10,
+        deadband_relative=0.02,
+    ),
+    ESolarSensorEntityDescription(
+        key="inverter_battery_soc",
+        unique_id_format="Battery_SOC_{}",
+        name_format="Inverter {} Battery State Of Charge",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_inverter_battery_soc,
+        attributes=(
+            I_MODEL,
+            I_SN,
+            B_CAPACITY,
+            B_CURRENT,
+            B_POWER,
+            B_DIRECTION,
+            G_POWER,
+            B_GRID_DIRECT,
+            IO_POWER,
+            IO_DIRECTION,
+            PV_POWER,
+            PV_DIRECTION,
+            B_T_LOAD,
+            B_H_LOAD,
+            B_B_LOAD,
+            S_POWER,
+        ),
+        attrs_fn=_inverter_battery_attrs,
+        plant_types=(3,),
+        deadband=1,
+    ),
+)
+
+
+def _supports(description: ESolarSensorEntityDescription, plant_type: int) -> bool:
+    """Return whether a sensor applies to a plant of the given type."""
+    return description.plant_types is None or plant_type in description.plant_types
+
+
+# Optional sensors for the values that are otherwise only attributes
+PHASE_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    *(
+        ESolarSensorEntityDescription(
+            key=f"pv{pv}_{name}",
+            unique_id_format=f"inverter_{{}}_pv{pv}_{name}",
+            name_format=f"Inverter {{}} PV{pv} {name.capitalize()}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+            value_fn=partial(_rawdata_value, f"pV{pv}{field}"),
+            requires_pv_grid_data=True,
+            deadband=deadband,
+        )
+        for pv in (1, 2, 3)
+        for field, name, unit, device_class, deadband in (
+            (
+                "Volt",
+                "voltage",
+                UnitOfElectricPotential.VOLT,
+                SensorDeviceClass.VOLTAGE,
+                1,
+            ),
+            (
+                "Curr",
+                "current",
+                UnitOfElectricCurrent.AMPERE,
+                SensorDeviceClass.CURRENT,
+                0.1,
+            ),
+        )
+    ),
+    *(
+        ESolarSensorEntityDescription(
+            key=f"grid_{name}_{phase}",
+            unique_id_format=f"inverter_{{}}_grid_{name}_{phase}",
+            name_format=f"Inverter {{}} Grid {name.capitalize()} {phase.upper()}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+            value_fn=partial(_rawdata_value, f"{phase}Grid{field}"),
+            requires_pv_grid_data=True,
+            deadband=deadband,
+        )
+        for phase in "rst"
+        for field, name, unit, device_class, deadband in (
+            (
+                "Volt",
+                "voltage",
+                UnitOfElectricPotential.VOLT,
+                SensorDeviceClass.VOLTAGE,
+                1,
+            ),
+            (
+                "Curr",
+                "current",
+                UnitOfElectricCurrent.AMPERE,
+                SensorDeviceClass.CURRENT,
+                0.1,
+            ),
+            (
+                "Freq",
+                "frequency",
+                UnitOfFrequency.HERTZ,
+                SensorDeviceClass.FREQUENCY,
+                0.05,
+            ),
+        )
+    ),
+    # The battery inverter lists, per phase or for phase R only
+    *(
+        ESolarSensorEntityDescription(
+            key=f"{key}_{phase}",
+            unique_id_format=f"inverter_{{}}_{key}_{phase}",
+            name_format=f"Inverter {{}} {name} {phase.upper()}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+            value_fn=partial(_rawdata_value, f"{phase}{field}"),
+            plant_types=(3,),
+            requires_pv_grid_data=True,
+            deadband=deadband,
+            deadband_relative=deadband_relative,
+        )
+        for phase in "rst"
+        for field, key, name, unit, device_class, deadband, deadband_relative in (
+            (
+                "GridPowerWatt",
+                "grid_power",
+                "Grid Power",
+                UnitOfPower.WATT,
+                SensorDeviceClass.POWER,
+                10,
+                0.02,
+            ),
+            (
+                "GridPowerVA",
+                "grid_apparent_power",
+                "Grid Apparent Power",
+                UnitOfApparentPower.VOLT_AMPERE,
+                SensorDeviceClass.APPARENT_POWER,
+                10,
+                0.02,
+            ),
+            (
+                "OutVolt",
+                "output_voltage",
+                "Output Voltage",
+                UnitOfElectricPotential.VOLT,
+                SensorDeviceClass.VOLTAGE,
+                1,
+                0,
+            ),
+            (
+                "OutCurr",
+                "output_current",
+                "Output Current",
+                UnitOfElectricCurrent.AMPERE,
+                SensorDeviceClass.CURRENT,
+                0.1,
+                0,
+            ),
+            (
+                "OutPowerWatt",
+                "output_power",
+                "Output Power",
+                UnitOfPower.WATT,
+                SensorDeviceClass.POWER,
+                10,
+                0.02,
+            ),
+            (
+                "OutPowerVA",
+                "output_apparent_power",
+                "Output Apparent Power",
+                UnitOfApparentPower.VOLT_AMPERE,
+                SensorDeviceClass.APPARENT_POWER,
+                10,
+                0.02,
+            ),
+            (
+                "OutFreq",
+                "output_frequency",
+                "Output Frequency",
+                UnitOfFrequency.HERTZ,
+                SensorDeviceClass.FREQUENCY,
+                0.05,
+                0,
+            ),
+            (
+                "OnGridOutVolt",
+                "on_grid_output_voltage",
+                "On-grid Output Voltage",
+                UnitOfElectricPotential.VOLT,
+                SensorDeviceClass.VOLTAGE,
+                1,
+                0,
+            ),
+            (
+                "OnGridOutPowerWatt",
+                "on_grid_output_power",
+                "On-grid Output Power",
+                UnitOfPower.WATT,
+                SensorDeviceClass.POWER,
+                10,
+                0.02,
+            ),
+        )
+    ),
+    *(
+        ESolarSensorEntityDescription(
+            key=key,
+            unique_id_format=f"inverter_{{}}_{key}",
+            name_format=f"Inverter {{}} {name}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+            value_fn=partial(_rawdata_value, field),
+            plant_types=(3,),
+            requires_pv_grid_data=True,
+            deadband=deadband,
+            deadband_relative=deadband_relative,
+        )
+        for field, key, name, unit, device_class, deadband, deadband_relative in (
+            (
+                "rOnGridOutFreq",
+                "on_grid_output_frequency",
+                "On-grid Output Frequency",
+                UnitOfFrequency.HERTZ,
+                SensorDeviceClass.FREQUENCY,
+                0.05,
+                0,
+            ),
+            (
+                "rBackupPowerWatt",
+                "backup_power",
+                "Backup Power",
+                UnitOfPower.WATT,
+                SensorDeviceClass.POWER,
+                10,
+                0.02,
+            ),
+        )
+    ),
+)
+
+FLOW_SENSORS: tuple[ESolarSensorEntityDescription, ...] = tuple(
+    ESolarSensorEntityDescription(
+        key=key,
+        unique_id_format=f"inverter_{{}}_{key}",
+        name_format=f"Inverter {{}} {name}",
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=partial(_store_power_value, field),
+        plant_types=(3,),
+        deadband=deadband,
+        deadband_relative=0.02,
+    )
+    for field, key, name, unit, device_class, deadband in (
+        (
+            "batCurr",
+            "battery_current",
+            "Battery Current",
+            UnitOfElectricCurrent.AMPERE,
+            SensorDeviceClass.CURRENT,
+            0.1,
+        ),
+        (
+            "batteryPower",
+            "battery_power",
+            "Battery Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "gridPower",
+            "grid_power",
+            "Grid Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "inputOutputPower",
+            "input_output_power",
+            "Input Output Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "pvPower",
+            "pv_power",
+            "PV Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "solarPower",
+            "solar_power",
+            "Solar Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "totalLoadPower",
+            "total_load_power",
+            "Total Load Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "homeLoadPower",
+            "home_load_power",
+            "Home Load Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+        (
+            "backupLoadPower",
+            "backup_load_power",
+            "Backup Load Power",
+            UnitOfPower.WATT,
+            SensorDeviceClass.POWER,
+            10,
+        ),
+    )
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -124,6 +903,7 @@ async def async_setup_entry(
     my_plants = entry.options.get(CONF_MONITORED_SITES)
     use_inverter_sensors = entry.options.get(CONF_INVERTER_SENSORS)
     use_pv_grid_attributes = entry.options.get(CONF_PV_GRID_DATA)
+    plant_list_only = entry.options.get(CONF_PLANT_LIST_ONLY, False)
 
     if my_plants is None:
         return
@@ -133,1100 +913,203 @@ async def async_setup_entry(
             if plant["plantname"] != enabled_plant:
                 continue
 
-            _LOGGER.debug(
-                "Setting up ESolarSensorPlant sensor for %s", plant["plantname"]
-            )
-            entities.append(
-                ESolarSensorPlant(coordinator, plant["plantname"], plant["plantuid"])
-            )
-            if plant["type"] == 0:
-                _LOGGER.debug(
-                    "Setting up ESolarSensorPlantTotalEnergy sensor for %s",
-                    plant["plantname"],
-                )
-                entities.append(
-                    ESolarSensorPlantTotalEnergy(
-                        coordinator, plant["plantname"], plant["plantuid"]
-                    )
-                )
-            elif plant["type"] == 3:
-                _LOGGER.debug(
-                    "Setting up ESolarSensorPlantBatterySellEnergy sensor for %s",
-                    plant["plantname"],
-                )
-                entities.append(
-                    ESolarSensorPlantBatterySellEnergy(
-                        coordinator, plant["plantname"], plant["plantuid"]
-                    )
-                )
-                _LOGGER.debug(
-                    "Setting up ESolarSensorPlantBatteryBuyEnergy sensor for %s",
-                    plant["plantname"],
-                )
-                entities.append(
-                    ESolarSensorPlantBatteryBuyEnergy(
-                        coordinator, plant["plantname"], plant["plantuid"]
-                    )
-                )
-                _LOGGER.debug(
-                    "Setting up ESolarSensorPlantBatteryChargeEnergy sensor for %s",
-                    plant["plantname"],
-                )
-                entities.append(
-                    ESolarSensorPlantBatteryChargeEnergy(
-                        coordinator, plant["plantname"], plant["plantuid"]
-                    )
-                )
-                _LOGGER.debug(
-                    "Setting up ESolarSensorPlantBatteryDischargeEnergy sensor for %s",
-                    plant["plantname"],
-                )
-                entities.append(
-                    ESolarSensorPlantBatteryDischargeEnergy(
-                        coordinator, plant["plantname"], plant["plantuid"]
-                    )
-                )
+            for description in PLANT_SENSORS:
+                if plant_list_only:
+                    # Only the values of getUserPlantList are polled
+                    if not description.plant_list_only:
+                        continue
+                elif not _supports(description, plant["type"]):
+                    continue
                 _LOGGER.debug(
-                    "Setting up ESolarSensorPlantBatterySoC sensor for %s",
-                    plant["plantname"],
+                    "Setting up %s sensor for %s", description.key, plant["plantname"]
                 )
                 entities.append(
-                    ESolarSensorPlantBatterySoC(
-                        coordinator, plant["plantname"], plant["plantuid"]
+                    ESolarSensor(
+                        coordinator,
+                        description,
+                        plant["plantname"],
+                        plant["plantuid"],
+                        use_pv_grid_attributes=use_pv_grid_attributes,
                     )
                 )
 
-            if use_inverter_sensors:
-                for inverter in plant["plantDetail"]["snList"]:
-                    _LOGGER.debug(
-                        "Setting up ESolarInverterEnergyTotal sensor for %s and inverter %s",
-                        plant["plantname"],
-                        inverter,
-                    )
-                    entities.append(
-                        ESolarInverterEnergyTotal(
-                            coordinator,
-                            plant["plantname"],
-                            plant["plantuid"],
-                            inverter,
-                        )
-                    )
+            if plant_list_only or not use_inverter_sensors:
+                continue
+            for inverter in plant["plantDetail"]["snList"]:
+                for description in INVERTER_SENSORS + PHASE_SENSORS + FLOW_SENSORS:
+                    if not _supports(description, plant["type"]):
+                        continue
+                    if description.requires_pv_grid_data and not use_pv_grid_attributes:
+                        continue
                     _LOGGER.debug(
-                        "Setting up ESolarInverterPower sensor for %s and inverter %s",
+                        "Setting up %s sensor for %s and inverter %s",
+                        description.key,
                         plant["plantname"],
                         inverter,
                     )
                     entities.append(
-                        ESolarInverterPower(
+                        ESolarSensor(
                             coordinator,
+                            description,
                             plant["plantname"],
                             plant["plantuid"],
                             inverter,
                             use_pv_grid_attributes,
                         )
                     )
-                    if plant["type"] == 3:
-                        _LOGGER.debug(
-                            "Setting up ESolarInverterBatterySoC sensor for %s and inverter %s",
-                            plant["plantname"],
-                            inverter,
-                        )
-                        entities.append(
-                            ESolarInverterBatterySoC(
-                                coordinator,
-                                plant["plantname"],
-                                plant["plantuid"],
-                                inverter,
-                            )
-                        )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
 class ESolarSensor(CoordinatorEntity[ESolarCoordinator], SensorEntity):
-    """Representation of a generic ESolar sensor."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._coordinator = coordinator
-        self._plant_name = plant_name
-        self._plant_uid = plant_uid
-
-        self._device_name: None | str = None
-        self._device_model: None | str = None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device_info of the device."""
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._plant_name)},
-            manufacturer=MANUFACTURER,
-            model=self._device_model,
-            name=self._device_name,
-        )
-
-        return device_info
-
-
-class ESolarSensorPlant(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
+    """Representation of an eSolar plant or inverter sensor."""
 
-        self._attr_icon = ICON_PANEL
-        self._attr_name = f"Plant {self._plant_name} Status"
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-            P_ADR: None,
-            P_TYPE: None,
-            P_POWER: None,
-            P_CURRENCY: None,
-            P_TOTAL_E: None,
-            P_CO2: None,
-            P_TREES: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-                self._attr_extra_state_attributes[P_ADR] = (
-                    plant["address"] + " " + plant["country"]
-                )
-                if plant["type"] == 0:
-                    self._attr_extra_state_attributes[P_TYPE] = P_TYPE_GRID
-                if plant["type"] == 1:
-                    self._attr_extra_state_attributes[P_TYPE] = P_TYPE_STORAGE
-                if plant["type"] == 2:
-                    self._attr_extra_state_attributes[P_TYPE] = P_TYPE_BLEND
-                if plant["type"] == 3:
-                    self._attr_extra_state_attributes[P_TYPE] = P_TYPE_AC_COUPLING
-                self._attr_extra_state_attributes[P_POWER] = float(plant["systempower"])
-                self._attr_extra_state_attributes[P_CURRENCY] = plant["currency"]
-
-                # Setup state
-                if plant["runningState"] == 1:
-                    self._attr_native_value = "Normal"
-                elif plant["runningState"] == 2:
-                    self._attr_native_value = "Alarm"
-                elif plant["runningState"] == 3:
-                    self._attr_native_value = "Offline"
-                else:
-                    self._attr_native_value = None
-
-    @property
-    def native_value(self) -> str | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup dynamic attributes
-                if (plant["plantDetail"]["type"]) == 0:
-                    self._attr_extra_state_attributes[P_INCOME] = plant["plantDetail"][
-                        "income"
-                    ]
-                else:
-                    self._attr_extra_state_attributes[P_INCOME] = None
-                self._attr_extra_state_attributes[P_CO2] = plant["plantDetail"][
-                    "totalReduceCo2"
-                ]
-                self._attr_extra_state_attributes[P_TREES] = plant["plantDetail"][
-                    "totalPlantTreeNum"
-                ]
-                self._attr_extra_state_attributes[P_TOTAL_E] = plant["totalElectricity"]
-
-                # Setup state
-                if plant["runningState"] == 1:
-                    value = "Normal"
-                elif plant["runningState"] == 2:
-                    value = "Alarm"
-                elif plant["runningState"] == 3:
-                    value = "Offline"
-                else:
-                    value = None
-
-        return value
-
-
-class ESolarSensorPlantTotalEnergy(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Energy Total "
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-            P_TODAY_E: None,
-            P_CURRENT_POWER: None,
-            P_PEAK_POWER: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-                # Setup state
-                self._attr_native_value = float(plant["totalElectricity"])
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup dynamic attributes
-                self._attr_extra_state_attributes[P_TODAY_E] = float(
-                    plant["todayElectricity"]
-                )
-                self._attr_extra_state_attributes[P_CURRENT_POWER] = float(
-                    plant["nowPower"]
-                )
-                if plant["type"] == 0:
-                    peak_power = float(0.0)
-                    if plant["peakList"] is not None:
-                        for inverter in plant["peakList"]:
-                            peak_power += inverter["peakPower"]
-                    self._attr_extra_state_attributes[P_PEAK_POWER] = float(peak_power)
-                else:
-                    self._attr_extra_state_attributes[P_PEAK_POWER] = None
-
-                # Setup state
-                value = float(plant["totalElectricity"])
-
-        return value
-
-
-class ESolarSensorPlantBatteryBuyEnergy(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_buy_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Buy Energy Total"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-                # Setup state
-                if plant["plantDetail"]["totalBuyElec"] is not None:
-                    self._attr_native_value = float(
-                        plant["plantDetail"]["totalBuyElec"]
-                    )
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup state
-                if plant["plantDetail"]["totalBuyElec"] is not None:
-                    value = float(plant["plantDetail"]["totalBuyElec"])
-
-        return value
-
-
-class ESolarSensorPlantBatterySellEnergy(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_sell_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Sell Energy Total"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-                # Setup state
-                if plant["plantDetail"]["totalSellElec"] is not None:
-                    self._attr_native_value = float(
-                        plant["plantDetail"]["totalSellElec"]
-                    )
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup state
-                if plant["plantDetail"]["totalSellElec"] is not None:
-                    value = float(plant["plantDetail"]["totalSellElec"])
-
-        return value
-
-
-class ESolarSensorPlantBatteryChargeEnergy(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_charge_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Charge Energy"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-                # Setup state
-                charge = float(0)
-                if "beanList" in plant and plant["beanList"] is not None:
-                    for bean in plant["beanList"]:
-                        charge += float(bean["chargeElec"])
-                self._attr_native_value = charge
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup state
-                charge = float(0)
-                if "beanList" in plant and plant["beanList"] is not None:
-                    for bean in plant["beanList"]:
-                        charge += float(bean["chargeElec"])
-                value = charge
-
-        return value
-
-
-class ESolarSensorPlantBatteryDischargeEnergy(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_discharge_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Discharge Energy"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-                # Setup state
-                discharge = float(0)
-                if "beanList" in plant and plant["beanList"] is not None:
-                    for bean in plant["beanList"]:
-                        discharge += float(bean["dischargeElec"])
-                self._attr_native_value = discharge
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup state
-                discharge = float(0)
-                if "beanList" in plant and plant["beanList"] is not None:
-                    for bean in plant["beanList"]:
-                        discharge += float(bean["dischargeElec"])
-                value = discharge
-
-        return value
-
-
-class ESolarSensorPlantBatterySoC(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_battery_soc_{plant_uid}"
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_name = f"Plant {self._plant_name} State Of Charge"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        installed_power = float(0)
-        available_power = float(0)
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            # Setup static attributes
-            self._attr_available = True
-            self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-            self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-
-            # Setup state
-            for inverter in plant["plantDetail"]["snList"]:
-                if "kitList" not in plant or plant["kitList"] is None:
-                    continue
-                for kit in plant["kitList"]:
-                    if inverter == kit["devicesn"] and kit["onLineStr"] == "1":
-                        installed_power += kit["storeDevicePower"]["batCapcity"]
-                        available_power += (
-                            kit["storeDevicePower"]["batCapcity"]
-                            * kit["storeDevicePower"]["batEnergyPercent"]
-                        )
-
-            if installed_power > 0:
-                self._attr_native_value = float(available_power / installed_power)
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        installed_power = float(0)
-        available_power = float(0)
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            # Setup state
-            for inverter in plant["plantDetail"]["snList"]:
-                if "kitList" not in plant or plant["kitList"] is None:
-                    continue
-                for kit in plant["kitList"]:
-                    if inverter == kit["devicesn"] and kit["onLineStr"] == "1":
-                        installed_power += kit["storeDevicePower"]["batCapcity"]
-                        available_power += (
-                            kit["storeDevicePower"]["batCapcity"]
-                            * kit["storeDevicePower"]["batEnergyPercent"]
-                        )
-            if installed_power > 0:
-                value = float(available_power / installed_power)
-            else:
-                value = None
-
-        return value
-
-
-class ESolarInverterEnergyTotal(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
-
-    def __init__(
-        self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"inverter_{inverter_sn}"
-        self.inverter_sn = inverter_sn
-
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} Energy Total"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-            I_MODEL: None,
-            I_TYPE: None,
-            I_SN: None,
-            I_PC: None,
-            I_DB: None,
-            I_CTR: None,
-            I_MOD_SN: None,
-            I_TODAY_E: None,
-            I_MONTH_E: None,
-            I_TOTAL_E: None,
-            I_STATUS: None,
-            I_CURRENT_POWER: None,
-        }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-                if "kitList" not in plant or plant["kitList"] is None:
-                    continue
-                for kit in plant["kitList"]:
-                    if kit["devicesn"] == self.inverter_sn:
-                        self._attr_extra_state_attributes[I_MODEL] = kit["devicetype"]
-
-                        if kit["type"] == 0:
-                            self._attr_extra_state_attributes[I_TYPE] = P_TYPE_ONGRID
-                        elif kit["type"] == 1:
-                            self._attr_extra_state_attributes[I_TYPE] = P_TYPE_STORAGE
-                        elif kit["type"] == 2:
-                            self._attr_extra_state_attributes[
-                                I_TYPE
-                            ] = P_TYPE_AC_COUPLING
-                        else:
-                            self._attr_extra_state_attributes[I_TYPE] = P_UNKNOWN
-
-                        self._attr_extra_state_attributes[I_SN] = kit["devicesn"]
-                        self._attr_extra_state_attributes[I_PC] = kit["devicepc"]
-                        self._attr_extra_state_attributes[I_DB] = kit["displayfw"]
-                        self._attr_extra_state_attributes[I_CTR] = kit["mastermcufw"]
-                        self._attr_extra_state_attributes[I_MOD_SN] = kit["kitSn"]
-
-                        # Setup state
-                        self._attr_native_value = float(kit["totalSellEnergy"])
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        value = None
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            if "kitList" in plant and plant["kitList"] is not None:
-                for kit in plant["kitList"]:
-                    if kit["devicesn"] != self.inverter_sn:
-                        continue
-                    # Setup state
-                    value = float(kit["totalSellEnergy"])
-
-                    # Setup dynamic attributes
-                    self._attr_extra_state_attributes[I_TODAY_E] = float(
-                        kit["todaySellEnergy"]
-                    )
-                    self._attr_extra_state_attributes[I_MONTH_E] = float(
-                        kit["monthSellEnergy"]
-                    )
-                    self._attr_extra_state_attributes[I_TOTAL_E] = float(
-                        kit["totalSellEnergy"]
-                    )
-                    if kit["onLineStr"] == "1":
-                        self._attr_extra_state_attributes[I_STATUS] = I_NORMAL
-                    elif kit["onLineStr"] == "2":
-                        self._attr_extra_state_attributes[I_STATUS] = I_ALARM
-                    elif kit["onLineStr"] == "3":
-                        self._attr_extra_state_attributes[I_STATUS] = I_OFFLINE
-                    elif kit["onLineStr"] == "4":
-                        self._attr_extra_state_attributes[I_STATUS] = I_STOCK
-                    elif kit["onLineStr"] == "4":
-                        self._attr_extra_state_attributes[I_STATUS] = I_HISTORY
-                    else:
-                        self._attr_extra_state_attributes[I_STATUS] = P_UNKNOWN
-
-                    self._attr_extra_state_attributes[I_CURRENT_POWER] = kit["powernow"]
-
-                    if kit["type"] == 2:
-                        if kit["storeDevicePower"]["batteryDirection"] == 0:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
-                        elif kit["storeDevicePower"]["batteryDirection"] == 1:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
-                        elif kit["storeDevicePower"]["batteryDirection"] == -1:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
-                        else:
-                            self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-            if "beanList" in plant and plant["beanList"] is not None:
-                for bean in plant["beanList"]:
-                    if bean["devicesn"] == self.inverter_sn:
-                        self._attr_extra_state_attributes[B_PVELEC] = bean["pvElec"]
-                        self._attr_extra_state_attributes[B_USELEC] = bean["useElec"]
-                        self._attr_extra_state_attributes[B_BUYELEC] = bean["buyElec"]
-                        self._attr_extra_state_attributes[B_SELLELEC] = bean["sellElec"]
-                        self._attr_extra_state_attributes[B_BUY_RATE] = bean["buyRate"]
-                        self._attr_extra_state_attributes[B_SELL_RATE] = bean[
-                            "sellRate"
-                        ]
-
-        return value
-
-
-class ESolarInverterPower(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
+    entity_description: ESolarSensorEntityDescription
+    _unrecorded_attributes = STATIC_ATTRIBUTES | HIGH_CHURN_ATTRIBUTES
 
     def __init__(
         self,
         coordinator: ESolarCoordinator,
+        description: ESolarSensorEntityDescription,
         plant_name,
         plant_uid,
-        inverter_sn,
-        use_pv_grid_attributes,
+        inverter_sn=None,
+        use_pv_grid_attributes=False,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._coordinator = coordinator
+        self._plant_name = plant_name
+        self._plant_uid = plant_uid
+        self.inverter_sn = inverter_sn
         self.use_pv_grid_attributes = use_pv_grid_attributes
-        self._last_updated: datetime.datetime | None = None
         self._attr_available = False
-        self._attr_unique_id = f"PV_{inverter_sn}"
+        self._written_available = False
+        self._written_value: StateType = None
+        self._written_attributes: dict[str, Any] = {}
+        self._written_at = 0.0
+        # Set while a computed state within the deadband is not written yet
+        self._held_back = False
+
+        if inverter_sn is None:
+            self._attr_unique_id = description.unique_id_format.format(plant_uid)
+            self._attr_name = description.name_format.format(plant_name)
+        else:
+            self._attr_unique_id = description.unique_id_format.format(inverter_sn)
+            self._attr_name = description.name_format.format(inverter_sn)
 
         self._device_name = plant_name
         self._device_model = PLANT_MODEL
-        self.inverter_sn = inverter_sn
 
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} Power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-        if self.use_pv_grid_attributes:
-            self._attr_extra_state_attributes = {
-                P_NAME: None,
-                P_UID: None,
-                I_MODEL: None,
-                I_SN: None,
-                I_PV_VOL_PV: None,
-                I_PV_CURR_PV: None,
-                I_G_VOL_L: None,
-                I_G_CURR_L: None,
-                I_G_FREQ_L: None,
-            }
+        attributes = (P_NAME, P_UID) + description.attributes
+        if use_pv_grid_attributes:
+            attributes += description.pv_grid_attributes
+        self._attr_extra_state_attributes = dict.fromkeys(attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Compute the state from the data the entity was created with."""
+        await super().async_added_to_hass()
+        self._update_from_data()
+        self._remember_written()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Compute the state if its source changed, write it if it changed enough."""
+        index = self._coordinator.index
+        if self.available == self._written_available:
+            if self._plant_uid not in index.changed_plants and (
+                self.inverter_sn is None
+                or self.inverter_sn not in index.changed_devices
+            ):
+                # A held back state is still written once the heartbeat is due
+                if not self._held_back or not self._heartbeat_due():
+                    return
+            else:
+                self._update_from_data()
+                if self._within_deadband():
+                    self._held_back = True
+                    return
         else:
-            self._attr_extra_state_attributes = {
-                P_NAME: None,
-                P_UID: None,
-                I_MODEL: None,
-                I_SN: None,
-            }
-
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-                self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-                if "kitList" in plant and plant["kitList"] is not None:
-                    for kit in plant["kitList"]:
-                        if kit["devicesn"] == self.inverter_sn:
-                            self._attr_extra_state_attributes[I_MODEL] = kit[
-                                "devicetype"
-                            ]
-                            self._attr_extra_state_attributes[I_SN] = kit["devicesn"]
-
-                            # Setup state
-                            self._attr_native_value = float(kit["powernow"])
-
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        value = None
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            # Setup dynamic attributes
-            if "kitList" not in plant or plant["kitList"] is None:
-                continue
-            for kit in plant["kitList"]:
-                if kit["devicesn"] != self.inverter_sn:
-                    continue
-
-                # Setup state
-                value = float(kit["powernow"])
-
-                if not self.use_pv_grid_attributes:
-                    continue
+            self._update_from_data()
+        self._remember_written()
+        super()._handle_coordinator_update()
+
+    def _recorded_attributes(self) -> dict[str, Any]:
+        """Return the attributes that are not expected to change on every update."""
+        return {
+            key: value
+            for key, value in self._attr_extra_state_attributes.items()
+            if key not in HIGH_CHURN_ATTRIBUTES
+        }
 
-                if kit["onLineStr"] == "1":
-                    self._attr_extra_state_attributes[I_PV_VOL_PV] = [
-                        kit["findRawdataPageList"]["pV1Volt"],
-                        kit["findRawdataPageList"]["pV2Volt"],
-                        kit["findRawdataPageList"]["pV3Volt"],
-                    ]
-                    self._attr_extra_state_attributes[I_PV_CURR_PV] = [
-                        kit["findRawdataPageList"]["pV1Curr"],
-                        kit["findRawdataPageList"]["pV2Curr"],
-                        kit["findRawdataPageList"]["pV3Curr"],
-                    ]
-                    self._attr_extra_state_attributes[I_G_VOL_L] = [
-                        kit["findRawdataPageList"]["rGridVolt"],
-                        kit["findRawdataPageList"]["sGridVolt"],
-                        kit["findRawdataPageList"]["tGridVolt"],
-                    ]
-                    self._attr_extra_state_attributes[I_G_CURR_L] = [
-                        kit["findRawdataPageList"]["rGridCurr"],
-                        kit["findRawdataPageList"]["sGridCurr"],
-                        kit["findRawdataPageList"]["tGridCurr"],
-                    ]
-                    self._attr_extra_state_attributes[I_G_FREQ_L] = [
-                        kit["findRawdataPageList"]["rGridFreq"],
-                        kit["findRawdataPageList"]["sGridFreq"],
-                        kit["findRawdataPageList"]["tGridFreq"],
-                    ]
-                    if (kit["findRawdataPageList"]["deviceType"]) == 2:
-
-                        self._attr_extra_state_attributes[B_GRID_POWER_W] = [
-                            kit["findRawdataPageList"]["rGridPowerWatt"],
-                            kit["findRawdataPageList"]["sGridPowerWatt"],
-                            kit["findRawdataPageList"]["tGridPowerWatt"],
-                        ]
-                        self._attr_extra_state_attributes[B_GRID_POWER_VA] = [
-                            kit["findRawdataPageList"]["rGridPowerVA"],
-                            kit["findRawdataPageList"]["sGridPowerVA"],
-                            kit["findRawdataPageList"]["tGridPowerVA"],
-                        ]
-                        self._attr_extra_state_attributes[B_OUT_VOLT] = [
-                            kit["findRawdataPageList"]["rOutVolt"],
-                            kit["findRawdataPageList"]["sOutVolt"],
-                            kit["findRawdataPageList"]["tOutVolt"],
-                        ]
-                        self._attr_extra_state_attributes[B_OUT_CURR] = [
-                            kit["findRawdataPageList"]["rOutCurr"],
-                            kit["findRawdataPageList"]["sOutCurr"],
-                            kit["findRawdataPageList"]["tOutCurr"],
-                        ]
-                        self._attr_extra_state_attributes[B_OUT_POWER_WATT] = [
-                            kit["findRawdataPageList"]["rOutPowerWatt"],
-                            kit["findRawdataPageList"]["sOutPowerWatt"],
-                            kit["findRawdataPageList"]["tOutPowerWatt"],
-                        ]
-                        self._attr_extra_state_attributes[B_OUT_POWER_VA] = [
-                            kit["findRawdataPageList"]["rOutPowerVA"],
-                            kit["findRawdataPageList"]["sOutPowerVA"],
-                            kit["findRawdataPageList"]["tOutPowerVA"],
-                        ]
-                        self._attr_extra_state_attributes[B_OUT_FREQ] = [
-                            kit["findRawdataPageList"]["rOutFreq"],
-                            kit["findRawdataPageList"]["sOutFreq"],
-                            kit["findRawdataPageList"]["tOutFreq"],
-                        ]
-                        self._attr_extra_state_attributes[B_ON_G_VOLT] = [
-                            kit["findRawdataPageList"]["rOnGridOutVolt"],
-                            kit["findRawdataPageList"]["sOnGridOutVolt"],
-                            kit["findRawdataPageList"]["tOnGridOutVolt"],
-                        ]
-                        self._attr_extra_state_attributes[B_ON_G_FREQ] = [
-                            kit["findRawdataPageList"]["rOnGridOutFreq"]
-                        ]
-                        self._attr_extra_state_attributes[B_ON_G_POWER_W] = [
-                            kit["findRawdataPageList"]["rOnGridOutPowerWatt"],
-                            kit["findRawdataPageList"]["sOnGridOutPowerWatt"],
-                            kit["findRawdataPageList"]["tOnGridOutPowerWatt"],
-                        ]
-                        self._attr_extra_state_attributes[B_ON_G_FREQ] = [
-                            kit["findRawdataPageList"]["rOnGridOutFreq"]
-                        ]
-                        self._attr_extra_state_attributes[B_BACKUP_POWER_W] = [
-                            kit["findRawdataPageList"]["rBackupPowerWatt"]
-                        ]
-                else:
-                    self._attr_extra_state_attributes[I_PV_VOL_PV] = [
-                        None,
-                        None,
-                        None,
-                    ]
-                    self._attr_extra_state_attributes[I_PV_CURR_PV] = [
-                        None,
-                        None,
-                        None,
-                    ]
-                    self._attr_extra_state_attributes[I_G_VOL_L] = [
-                        None,
-                        None,
-                        None,
-                    ]
-                    self._attr_extra_state_attributes[I_G_CURR_L] = [
-                        None,
-                        None,
-                        None,
-                    ]
-                    self._attr_extra_state_attributes[I_G_FREQ_L] = [
-                        None,
-                        None,
-                        None,
-                    ]
-
-        return value
-
-
-class ESolarInverterBatterySoC(ESolarSensor):
-    """Representation of a eSolar sensor for the plant."""
+    def _remember_written(self) -> None:
+        """Remember the state that is written, to compare the next one against."""
+        self._written_available = self.available
+        self._written_value = self._attr_native_value
+        self._written_attributes = self._recorded_attributes()
+        self._written_at = time.monotonic()
+        self._held_back = False
+
+    def _heartbeat_due(self) -> bool:
+        """Return whether the written state is older than the heartbeat interval."""
+        heartbeat = self._coordinator.heartbeat
+        return (
+            heartbeat is None
+            or time.monotonic() - self._written_at >= heartbeat.total_seconds()
+        )
 
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
+    def _within_deadband(self) -> bool:
+        """Return whether the new value is too close to the written one to write."""
+        description = self.entity_description
+        heartbeat = self._coordinator.heartbeat
+        if heartbeat is None or not (
+            description.deadband or description.deadband_relative
+        ):
+            return False
+        value, written = self._attr_native_value, self._written_value
+        if not isinstance(value, (int, float)) or not isinstance(written, (int, float)):
+            return False
+        if self._heartbeat_due():
+            return False
+        if self._recorded_attributes() != self._written_attributes:
+            return False
+        return abs(value - written) < max(
+            description.deadband, description.deadband_relative * abs(written)
         )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Battery_SOC_{inverter_sn}"
 
-        self._device_name = plant_name
-        self._device_model = PLANT_MODEL
-        self.inverter_sn = inverter_sn
-        self._attr_native_value = None
-
-        self._attr_name = f"Inverter {inverter_sn} Battery State Of Charge"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-            I_MODEL: None,
-            I_SN: None,
-            B_CAPACITY: None,
-            B_CURRENT: None,
-            B_POWER: None,
-            B_DIRECTION: None,
-            G_POWER: None,
-            B_GRID_DIRECT: None,
-            IO_POWER: None,
-            IO_DIRECTION: None,
-            PV_POWER: None,
-            PV_DIRECTION: None,
-            B_T_LOAD: None,
-            B_H_LOAD: None,
-            B_B_LOAD: None,
-            S_POWER: None,
-        }
+    def _update_from_data(self) -> None:
+        """Compute the state and attributes from the coordinator data."""
+        index = self._coordinator.index
+        if (plant := index.plants.get(self._plant_uid)) is None:
+            self._attr_native_value = None
+            return
+        source = ESolarSource(plant, index.aggregates[self._plant_uid], None, None)
+        if self.inverter_sn is not None:
+            source = source._replace(
+                kit=index.devices.get(self.inverter_sn),
+                bean=index.beans.get(self.inverter_sn),
+            )
 
-    async def async_update(self) -> None:
-        """Get the latest data and updates the states."""
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            # Setup static attributes
-            self._attr_available = True
-            self._attr_extra_state_attributes[P_NAME] = plant["plantname"]
-            self._attr_extra_state_attributes[P_UID] = plant["plantuid"]
-            if "kitList" not in plant or plant["kitList"] is None:
-                continue
-            for kit in plant["kitList"]:
-                if kit["devicesn"] == self.inverter_sn:
-                    self._attr_extra_state_attributes[I_MODEL] = kit["devicetype"]
-                    self._attr_extra_state_attributes[I_SN] = kit["devicesn"]
-                    self._attr_extra_state_attributes[B_CAPACITY] = kit[
-                        "storeDevicePower"
-                    ]["batCapcityStr"]
-
-                    # Setup state
-                    if kit["onLineStr"] == "1":
-                        self._attr_native_value = kit["storeDevicePower"][
-                            "batEnergyPercent"
-                        ]
+        description = self.entity_description
+        attributes = self._attr_extra_state_attributes
+        self._attr_available = True
+        attributes[P_NAME] = plant["plantname"]
+        attributes[P_UID] = plant["plantuid"]
+        if description.attrs_fn is not None:
+            attributes.update(description.attrs_fn(source))
+        if self.use_pv_grid_attributes and description.pv_grid_attrs_fn is not None:
+            attributes.update(description.pv_grid_attrs_fn(source))
+        self._attr_native_value = description.value_fn(source)
 
     @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
-        # Setup state
-        value = None
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantname"] != self._plant_name:
-                continue
-            if "kitList" not in plant or plant["kitList"] is None:
-                continue
-            for kit in plant["kitList"]:
-                if self.inverter_sn == kit["devicesn"] and kit["onLineStr"] == "1":
-                    value = float(kit["storeDevicePower"]["batEnergyPercent"])
-
-                    # Setup dynamic attributes
-                    self._attr_extra_state_attributes[B_CURRENT] = kit[
-                        "storeDevicePower"
-                    ]["batCurr"]
-                    self._attr_extra_state_attributes[B_POWER] = kit[
-                        "storeDevicePower"
-                    ]["batteryPower"]
-
-                    if kit["storeDevicePower"]["batteryDirection"] == 0:
-                        self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
-                    elif kit["storeDevicePower"]["batteryDirection"] == 1:
-                        self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
-                    elif kit["storeDevicePower"]["batteryDirection"] == -1:
-                        self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
-                    else:
-                        self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-
-                    self._attr_extra_state_attributes[G_POWER] = kit[
-                        "storeDevicePower"
-                    ]["gridPower"]
-
-                    if kit["storeDevicePower"]["gridDirection"] == 1:
-                        self._attr_extra_state_attributes[B_GRID_DIRECT] = B_EXPORT
-                    elif kit["storeDevicePower"]["gridDirection"] == -1:
-                        self._attr_extra_state_attributes[B_GRID_DIRECT] = B_IMPORT
-                    else:
-                        self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
-
-                    self._attr_extra_state_attributes[IO_POWER] = kit[
-                        "storeDevicePower"
-                    ]["inputOutputPower"]
-
-                    if kit["storeDevicePower"]["outPutDirection"] == 1:
-                        self._attr_extra_state_attributes[IO_DIRECTION] = B_EXPORT
-                    elif kit["storeDevicePower"]["outPutDirection"] == -1:
-                        self._attr_extra_state_attributes[IO_DIRECTION] = B_IMPORT
-                    else:
-                        self._attr_extra_state_attributes[IO_DIRECTION] = P_UNKNOWN
-
-                    self._attr_extra_state_attributes[PV_POWER] = kit[
-                        "storeDevicePower"
-                    ]["pvPower"]
-
-                    if kit["storeDevicePower"]["pvDirection"] == 1:
-                        self._attr_extra_state_attributes[PV_DIRECTION] = B_EXPORT
-                    elif kit["storeDevicePower"]["pvDirection"] == -1:
-                        self._attr_extra_state_attributes[PV_DIRECTION] = B_IMPORT
-                    else:
-                        self._attr_extra_state_attributes[PV_DIRECTION] = P_UNKNOWN
-
-                    self._attr_extra_state_attributes[B_T_LOAD] = kit[
-                        "storeDevicePower"
-                    ]["totalLoadPower"]
-                    self._attr_extra_state_attributes[B_H_LOAD] = kit[
-                        "storeDevicePower"
-                    ]["homeLoadPower"]
-                    self._attr_extra_state_attributes[B_B_LOAD] = kit[
-                        "storeDevicePower"
-                    ]["backupLoadPower"]
-                    self._attr_extra_state_attributes[S_POWER] = kit[
-                        "storeDevicePower"
-                    ]["solarPower"]
-
-        return value
+    def device_info(self) -> DeviceInfo:
+        """Return the device_info of the device."""
+        device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._plant_name)},
+            manufacturer=MANUFACTURER,
+            model=self._device_model,
+            name=self._device_name,
+        )
+
+        return device_info